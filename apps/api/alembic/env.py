@@ -11,8 +11,9 @@ from alembic import context
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from shared.database import Base  # noqa: E402
-import contexts.form_design.models  # noqa: F401 E402  — registers FormDraftModel
+import contexts.form_design.models  # noqa: F401 E402  — registers FormDraftModel, GenerationJobModel
 import contexts.form_catalog.models  # noqa: F401 E402 — registers PublishedFormModel
+import contexts.generation.models  # noqa: F401 E402 — registers GenerationCacheModel
 
 config = context.config
 
@@ -0,0 +1,48 @@
+"""form_draft_revisions
+
+Revision ID: 0b8d5e3f9a14
+Revises: f2a7c94e1b68
+Create Date: 2026-10-18 17:05:44.301592
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0b8d5e3f9a14'
+down_revision: Union[str, Sequence[str], None] = 'f2a7c94e1b68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('form_draft_revisions',
+    sa.Column('draft_id', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('snapshot', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('patch', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['draft_id'], ['form_drafts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('draft_id', 'version')
+    )
+    # Existing drafts start their history with a snapshot of their current version.
+    op.execute("""
+        INSERT INTO form_draft_revisions (draft_id, version, snapshot, created_at)
+        SELECT id, version,
+               jsonb_build_object(
+                   'name', name, 'description', description, 'status', status,
+                   'fields', fields, 'layout', layout, 'actions', actions,
+                   'css_overrides', css_overrides
+               ),
+               updated_at
+        FROM form_drafts
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('form_draft_revisions')
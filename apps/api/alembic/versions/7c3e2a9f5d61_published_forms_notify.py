@@ -0,0 +1,49 @@
+"""published_forms change notifications
+
+Revision ID: 7c3e2a9f5d61
+Revises: 0b8d5e3f9a14
+Create Date: 2026-10-18 19:05:41.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e2a9f5d61'
+down_revision: Union[str, Sequence[str], None] = '0b8d5e3f9a14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Consumed by contexts/form_catalog/hot.py. The payload carries no
+    # renderable, which could exceed NOTIFY's 8000-byte limit.
+    op.execute("""
+        CREATE FUNCTION notify_published_forms() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                PERFORM pg_notify('published_forms', json_build_object('op', TG_OP, 'id', OLD.id)::text);
+                RETURN OLD;
+            END IF;
+            PERFORM pg_notify('published_forms', json_build_object(
+                'op', TG_OP, 'id', NEW.id, 'published_at', NEW.published_at
+            )::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER published_forms_notify
+        AFTER INSERT OR UPDATE OR DELETE ON published_forms
+        FOR EACH ROW EXECUTE FUNCTION notify_published_forms()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER published_forms_notify ON published_forms")
+    op.execute("DROP FUNCTION notify_published_forms()")
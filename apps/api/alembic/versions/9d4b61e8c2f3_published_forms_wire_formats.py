@@ -0,0 +1,43 @@
+"""published_forms wire formats
+
+Revision ID: 9d4b61e8c2f3
+Revises: 7c3e2a9f5d61
+Create Date: 2026-10-18 20:12:07.551930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4b61e8c2f3'
+down_revision: Union[str, Sequence[str], None] = '7c3e2a9f5d61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('published_forms', sa.Column('renderable_json', sa.LargeBinary(), nullable=True))
+    op.add_column('published_forms', sa.Column('renderable_gzip', sa.LargeBinary(), nullable=True))
+    op.add_column('published_forms', sa.Column('renderable_br', sa.LargeBinary(), nullable=True))
+    op.add_column('published_forms', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    # Existing forms get their JSON and hash from the stored document; their
+    # compressed copies stay empty until they are next published.
+    op.execute("""
+        UPDATE published_forms
+        SET renderable_json = convert_to(renderable::text, 'UTF8'),
+            content_hash = encode(sha256(convert_to(renderable::text, 'UTF8')), 'hex')
+    """)
+    op.alter_column('published_forms', 'renderable_json', nullable=False)
+    op.alter_column('published_forms', 'content_hash', nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('published_forms', 'content_hash')
+    op.drop_column('published_forms', 'renderable_br')
+    op.drop_column('published_forms', 'renderable_gzip')
+    op.drop_column('published_forms', 'renderable_json')
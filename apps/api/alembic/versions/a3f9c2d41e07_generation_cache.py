@@ -0,0 +1,39 @@
+"""generation_cache
+
+Revision ID: a3f9c2d41e07
+Revises: 55d56121b513
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c2d41e07'
+down_revision: Union[str, Sequence[str], None] = '55d56121b513'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('generation_cache',
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('output', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('last_accessed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_generation_cache_expires_at'), 'generation_cache', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_generation_cache_last_accessed_at'), 'generation_cache', ['last_accessed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_generation_cache_last_accessed_at'), table_name='generation_cache')
+    op.drop_index(op.f('ix_generation_cache_expires_at'), table_name='generation_cache')
+    op.drop_table('generation_cache')
@@ -0,0 +1,32 @@
+"""listing keyset indexes
+
+Revision ID: e5b19d3c7f20
+Revises: c71e5b0a9d42
+Create Date: 2026-10-18 14:22:51.207413
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b19d3c7f20'
+down_revision: Union[str, Sequence[str], None] = 'c71e5b0a9d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_form_drafts_created_at_id', 'form_drafts', ['created_at', 'id'], unique=False)
+    op.create_index('ix_form_drafts_status_created_at_id', 'form_drafts', ['status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_published_forms_published_at_id', 'published_forms', ['published_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_published_forms_published_at_id', table_name='published_forms')
+    op.drop_index('ix_form_drafts_status_created_at_id', table_name='form_drafts')
+    op.drop_index('ix_form_drafts_created_at_id', table_name='form_drafts')
@@ -0,0 +1,37 @@
+"""published_forms unique draft_id
+
+Revision ID: f2a7c94e1b68
+Revises: e5b19d3c7f20
+Create Date: 2026-10-18 15:40:12.918265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2a7c94e1b68'
+down_revision: Union[str, Sequence[str], None] = 'e5b19d3c7f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep only the latest publication of each draft before enforcing uniqueness.
+    op.execute("""
+        DELETE FROM published_forms p
+        USING published_forms newer
+        WHERE p.draft_id = newer.draft_id
+          AND (p.published_at, p.id) < (newer.published_at, newer.id)
+    """)
+    op.drop_index(op.f('ix_published_forms_draft_id'), table_name='published_forms')
+    op.create_index(op.f('ix_published_forms_draft_id'), 'published_forms', ['draft_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_published_forms_draft_id'), table_name='published_forms')
+    op.create_index(op.f('ix_published_forms_draft_id'), 'published_forms', ['draft_id'], unique=False)
@@ -0,0 +1,122 @@
+"""Serialization benchmark — per-request CPU of the draft and catalog read paths
+on 100- and 1,000-field forms, before and after the trusted-data fast path.
+Run with: python bench_serialization.py [iterations]
+
+No database is needed: rows are given in the shape the driver returns them
+(JSONB columns as JSON text), so the numbers cover only work done in Python.
+"""
+import json
+import sys
+import os
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from pydantic import TypeAdapter
+from contexts.form_catalog.translator import CatalogTranslator
+from contexts.form_design.schemas import (
+    FormDraft, FormFieldDraft, FormLayoutDraft, FormActionDraft, FormFieldLayout,
+)
+from shared.renderable_form import FieldOption, RenderableForm
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FIELD_COUNTS = (100, 1000)
+
+
+def _draft(field_count: int) -> FormDraft:
+    now = datetime.now(timezone.utc).isoformat()
+    fields = [
+        FormFieldDraft(
+            key=f"field_{i}",
+            type="select" if i % 3 == 0 else "text",
+            label=f"Field {i}",
+            placeholder="…",
+            options=[FieldOption(label=v, value=v) for v in ("a", "b", "c")] if i % 3 == 0 else [],
+            layout=FormFieldLayout(col_span=1, order=i),
+        )
+        for i in range(field_count)
+    ]
+    return FormDraft(
+        id="bench", name="Benchmark", prompt="bench", created_at=now, updated_at=now,
+        fields=fields, layout=FormLayoutDraft(columns=2), actions=[FormActionDraft()],
+    )
+
+
+def _cpu_ms(fn, iterations: int) -> float:
+    fn()
+    started = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - started) / iterations * 1000
+
+
+def run(iterations: int):
+    response = TypeAdapter(FormDraft)
+    for field_count in FIELD_COUNTS:
+        draft = _draft(field_count)
+        row = draft.model_dump()
+        # What the driver hands over: JSONB columns as text, the rest as values.
+        columns = {k: json.dumps(v) if k in ("fields", "layout", "actions") else v for k, v in row.items()}
+        document_text = json.dumps(row)
+        renderable = CatalogTranslator().to_renderable(draft).model_dump()
+        renderable_text = json.dumps(renderable)
+
+        def decoded():
+            return {k: json.loads(v) if k in ("fields", "layout", "actions") else v for k, v in columns.items()}
+
+        def draft_before():
+            r = decoded()
+            model = FormDraft(
+                **{**r, "fields": [FormFieldDraft(**f) for f in r["fields"]],
+                   "layout": FormLayoutDraft(**r["layout"]),
+                   "actions": [FormActionDraft(**a) for a in r["actions"]]},
+            )
+            # What FastAPI does with a response_model: validate, then dump to bytes.
+            return response.dump_json(response.validate_python(model))
+
+        def draft_after():
+            return document_text.encode()
+
+        def to_schema_before():
+            r = decoded()
+            return FormDraft(
+                **{**r, "fields": [FormFieldDraft(**f) for f in r["fields"]],
+                   "layout": FormLayoutDraft(**r["layout"]),
+                   "actions": [FormActionDraft(**a) for a in r["actions"]]},
+            )
+
+        def to_schema_after():
+            return FormDraft.model_validate(decoded())
+
+        def catalog_before():
+            return RenderableForm(**json.loads(renderable_text)).model_dump_json().encode()
+
+        def catalog_after():
+            return renderable_text.encode()
+
+        cases = [
+            ("GET /design/drafts/{id}", draft_before, draft_after),
+            ("_to_schema (write paths)", to_schema_before, to_schema_after),
+            ("GET /catalog/forms/{id} (cache miss)", catalog_before, catalog_after),
+        ]
+        print(f"\n{field_count} fields — CPU per request, {iterations} iterations")
+        for name, before, after in cases:
+            b, a = _cpu_ms(before, iterations), _cpu_ms(after, iterations)
+            print(f"  {name:<38} {b:8.3f} ms → {a:8.3f} ms  ({b / a if a else float('inf'):.1f}×)")
+
+        # Why the default response class stays: pydantic's dump_json already
+        # writes bytes directly, which ORJSONResponse would replace with
+        # model_dump() + orjson.dumps().
+        if orjson is not None:
+            pydantic_ms = _cpu_ms(lambda: response.dump_json(draft), iterations)
+            orjson_ms = _cpu_ms(lambda: orjson.dumps(response.dump_python(draft, mode="json")), iterations)
+            print(f"  {'response_model dump_json vs orjson':<38} {pydantic_ms:8.3f} ms vs {orjson_ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
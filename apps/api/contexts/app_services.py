@@ -0,0 +1,75 @@
+"""Application-scoped collaborators, built once at startup and shared by every request.
+
+None of these hold per-request state: the validators and translators are pure,
+and GenerationService owns the LLM connection pool plus the routing, caching
+and single-flight state that only works when shared. The optional catalog
+listener keeps the process-wide renderable cache in sync with Postgres.
+"""
+from dataclasses import dataclass
+import httpx
+from fastapi import Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from contexts.form_catalog.cache import CATALOG_HOT_ENABLED, get_renderable_cache
+from contexts.form_catalog.hot import CatalogListener
+from contexts.form_catalog.service import FormCatalogService
+from contexts.form_catalog.translator import CatalogTranslator
+from contexts.form_design.importer import DraftImporter
+from contexts.form_design.service import FormDesignService
+from contexts.form_design.validator import FormDraftValidator
+from contexts.generation.providers import build_http_client, build_provider_pool
+from contexts.generation.service import GenerationService
+from contexts.generation.translator import LLMTranslator
+
+
+@dataclass
+class AppServices:
+    generation_service: GenerationService
+    llm_translator: LLMTranslator
+    validator: FormDraftValidator
+    catalog_translator: CatalogTranslator
+    http_client: httpx.AsyncClient
+    catalog_listener: CatalogListener | None = None
+
+    @classmethod
+    def create(cls) -> "AppServices":
+        http_client = build_http_client()
+        cache = get_renderable_cache()
+        return cls(
+            generation_service=GenerationService(providers=build_provider_pool(http_client)),
+            llm_translator=LLMTranslator(),
+            validator=FormDraftValidator(),
+            catalog_translator=CatalogTranslator(),
+            http_client=http_client,
+            catalog_listener=CatalogListener(cache) if CATALOG_HOT_ENABLED and cache is not None else None,
+        )
+
+    def start(self) -> None:
+        """Starts background work that only the API needs: the hot catalog's
+        listener. Standalone workers never serve catalog reads."""
+        if self.catalog_listener:
+            self.catalog_listener.start()
+
+    def design_service(self, db: AsyncSession, read_db: AsyncSession | None = None) -> FormDesignService:
+        return FormDesignService(
+            db,
+            generation_service=self.generation_service,
+            translator=self.llm_translator,
+            validator=self.validator,
+            catalog_translator=self.catalog_translator,
+            read_db=read_db,
+        )
+
+    def draft_importer(self, db: AsyncSession) -> DraftImporter:
+        return DraftImporter(db, validator=self.validator, catalog_translator=self.catalog_translator)
+
+    def catalog_service(self, db: AsyncSession, read_db: AsyncSession | None = None) -> FormCatalogService:
+        return FormCatalogService(db, translator=self.catalog_translator, read_db=read_db)
+
+    async def aclose(self) -> None:
+        if self.catalog_listener:
+            await self.catalog_listener.stop()
+        await self.http_client.aclose()
+
+
+def get_app_services(request: Request) -> AppServices:
+    return request.app.state.services
@@ -0,0 +1,143 @@
+"""Read-through cache of serialized RenderableForm JSON for the catalog read path.
+
+Entries carry the published_at of the row they were serialized from; a put
+never replaces a newer entry, so a slow cache fill racing a publish cannot
+resurrect the old form. The cache is per process: other workers pick up a
+republished form once their entry's TTL runs out, or, with the hot catalog
+(see hot.py), as soon as Postgres notifies them of the publish. Notified
+changes also fence the form, so a fill that read an older version, e.g. from
+a lagging replica, is refused even when the form was not cached.
+"""
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Callable, NamedTuple
+
+# Keep every worker's cache current through Postgres notifications (hot.py).
+CATALOG_HOT_ENABLED = os.getenv("CATALOG_HOT_ENABLED", "false").lower() == "true"
+
+
+class RenderedForm(NamedTuple):
+    published_at: datetime
+    etag: str
+    body: bytes
+    body_gzip: bytes | None = None
+    body_br: bytes | None = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + len(self.body_gzip or b"") + len(self.body_br or b"")
+
+    def encoded(self, encoding: str | None) -> bytes | None:
+        """The body in a content coding; None for a coding not stored."""
+        return {None: self.body, "gzip": self.body_gzip, "br": self.body_br}.get(encoding)
+
+
+class RenderableCache:
+    """LRU of serialized forms keyed by published form id, with a fixed TTL,
+    bounded by entry count and, optionally, by the total size of the bodies
+    in every stored coding."""
+
+    def __init__(
+        self,
+        ttl_seconds: float,
+        max_entries: int,
+        max_bytes: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, RenderedForm]] = OrderedDict()
+        self._bytes = 0
+        # Oldest published_at a put may store, per form; None once deleted.
+        self._fences: OrderedDict[str, datetime | None] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, published_id: str) -> RenderedForm | None:
+        entry = self._entries.get(published_id)
+        if entry is None:
+            return None
+        expires_at, form = entry
+        if expires_at <= self._clock():
+            self.invalidate(published_id)
+            return None
+        self._entries.move_to_end(published_id)
+        return form
+
+    def put(self, published_id: str, form: RenderedForm) -> None:
+        if published_id in self._fences:
+            fence = self._fences[published_id]
+            if fence is None or form.published_at < fence:
+                return
+        current = self._entries.get(published_id)
+        if current is not None:
+            if current[1].published_at > form.published_at:
+                return
+            self._bytes -= current[1].size
+        self._entries[published_id] = (self._clock() + self.ttl_seconds, form)
+        self._entries.move_to_end(published_id)
+        self._bytes += form.size
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+
+    def invalidate(self, published_id: str) -> None:
+        entry = self._entries.pop(published_id, None)
+        if entry is not None:
+            self._bytes -= entry[1].size
+
+    def fence(self, published_id: str, published_at: datetime | None) -> None:
+        """Records that the form was published at `published_at`, or deleted
+        when None: an older cached entry is dropped and older versions are
+        never stored again. Fences are kept for as many forms as the cache
+        holds entries, the least recently fenced dropped first."""
+        if published_id in self._fences:
+            current = self._fences[published_id]
+            if current is None or (published_at is not None and published_at < current):
+                published_at = current
+        self._fences[published_id] = published_at
+        self._fences.move_to_end(published_id)
+        while len(self._fences) > self.max_entries:
+            self._fences.popitem(last=False)
+
+        entry = self._entries.get(published_id)
+        if entry is not None and (published_at is None or entry[1].published_at < published_at):
+            self.invalidate(published_id)
+
+    def clear(self) -> None:
+        """Drops every entry. Fences stay: what they record is still true."""
+        self._entries.clear()
+        self._bytes = 0
+
+
+def build_renderable_cache() -> RenderableCache | None:
+    """CATALOG_CACHE_MAX_ENTRIES=0 turns the cache off. With CATALOG_HOT_ENABLED
+    the cache is kept current by notifications, so entries live for
+    CATALOG_HOT_TTL_SECONDS, which only bounds staleness if one is missed."""
+    max_entries = int(os.getenv("CATALOG_CACHE_MAX_ENTRIES", "10000"))
+    if max_entries <= 0:
+        return None
+    max_bytes = int(os.getenv("CATALOG_CACHE_MAX_BYTES", str(256 * 1024 * 1024))) or None
+    if CATALOG_HOT_ENABLED:
+        ttl_seconds = float(os.getenv("CATALOG_HOT_TTL_SECONDS", "3600"))
+    else:
+        ttl_seconds = float(os.getenv("CATALOG_CACHE_TTL_SECONDS", "60"))
+    return RenderableCache(ttl_seconds, max_entries, max_bytes)
+
+
+@lru_cache(maxsize=None)
+def get_renderable_cache() -> RenderableCache | None:
+    """Process-wide instance, so publishes through any service reach the read path."""
+    return build_renderable_cache()
@@ -0,0 +1,150 @@
+"""Hot catalog: keeps every worker's RenderableCache current with Postgres
+LISTEN/NOTIFY, so catalog reads are served from memory.
+
+A trigger on published_forms notifies CATALOG_CHANNEL with {"op", "id",
+"published_at"} on every insert, update and delete, whoever made the change.
+Each API process holds one listening connection. Every notification fences
+the form in the cache (RenderableCache.fence), so a read that fills the cache
+from a replica still lagging behind the change cannot store the old version.
+When a cached form is republished, it is reloaded from the primary in the
+background, and until then reads of it fall through to the database as
+before. Deleted forms are evicted.
+
+Notifications sent while the connection is down are lost, so every
+(re)connect starts from an empty cache. With CATALOG_HOT_PRELOAD the newest
+forms are then loaded again, up to the cache's entry and byte bounds; forms
+that do not fit are loaded on first read and evicted least-recently-used.
+"""
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+import asyncpg
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from contexts.form_catalog.cache import RenderableCache, RenderedForm
+from contexts.form_catalog.models import PublishedFormModel
+from contexts.form_catalog.service import RENDERED_COLUMNS, rendered_form
+from shared.database import AsyncSessionLocal, settings
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CHANNEL = "published_forms"
+CATALOG_HOT_PRELOAD = os.getenv("CATALOG_HOT_PRELOAD", "true").lower() == "true"
+# How often an idle listening connection is checked, so a silently dropped
+# connection does not leave the cache unsynchronised for long.
+_KEEPALIVE_SECONDS = 30
+_MAX_RECONNECT_DELAY_SECONDS = 30
+
+
+def _rendered_columns():
+    return select(PublishedFormModel.id, *RENDERED_COLUMNS)
+
+
+class CatalogListener:
+    def __init__(self, cache: RenderableCache, preload: bool = CATALOG_HOT_PRELOAD, dsn: str | None = None):
+        self.cache = cache
+        self.preload = preload
+        # asyncpg takes the libpq form of the URL, without a SQLAlchemy driver name.
+        self.dsn = dsn or make_url(settings.database_url).set(drivername="postgresql").render_as_string(
+            hide_password=False,
+        )
+        self._task: asyncio.Task | None = None
+        self._refreshes: set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        tasks = [t for t in (self._task, *self._refreshes) if t is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self) -> None:
+        delay = 1
+        while True:
+            try:
+                connection = await asyncpg.connect(self.dsn)
+            except (OSError, asyncpg.PostgresError) as e:
+                logger.warning("Catalog listener cannot connect (%s); retrying in %ss", e, delay)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _MAX_RECONNECT_DELAY_SECONDS)
+                continue
+            delay = 1
+            try:
+                await connection.add_listener(CATALOG_CHANNEL, self._on_notification)
+                self.cache.clear()
+                if self.preload:
+                    await self._preload()
+                while True:
+                    await asyncio.sleep(_KEEPALIVE_SECONDS)
+                    await connection.execute("SELECT 1")
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError, SQLAlchemyError) as e:
+                logger.warning("Catalog listener lost its connection (%s); reconnecting", e)
+            finally:
+                if not connection.is_closed():
+                    connection.terminate()
+
+    def _on_notification(self, connection, pid: int, channel: str, payload: str) -> None:
+        self.apply(json.loads(payload))
+
+    def apply(self, notification: dict) -> None:
+        """Applies one published_forms change to the cache."""
+        published_id = notification["id"]
+        if notification["op"] == "DELETE":
+            self.cache.fence(published_id, None)
+            return
+
+        published_at = datetime.fromisoformat(notification["published_at"])
+        cached = self.cache.get(published_id)
+        self.cache.fence(published_id, published_at)
+        # New forms are loaded on first read; a bulk import must not make
+        # every worker fetch every row. Only cached forms need replacing, and
+        # not when this process published them (cache_published primed it).
+        if cached is None or cached.published_at >= published_at:
+            return
+        task = asyncio.create_task(self._refresh(published_id))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+
+    async def _refresh(self, published_id: str) -> None:
+        # Always from the primary: a lagging replica could hand back the
+        # version the notification replaced.
+        try:
+            async with AsyncSessionLocal() as db:
+                row = (await db.execute(
+                    _rendered_columns().where(PublishedFormModel.id == published_id)
+                )).first()
+        except SQLAlchemyError as e:
+            # The entry stays invalidated, so the next read loads it instead.
+            logger.warning("Catalog refresh of %s failed: %s", published_id, e)
+            return
+        if row is not None:
+            self.cache.put(published_id, rendered_form(*row[1:]))
+
+    async def _preload(self) -> None:
+        """Loads the newest forms until the cache is full. They are put oldest
+        first, so the newest forms are the last to be evicted. Forms changed
+        while the preload ran are fenced, so their loaded copies are refused."""
+        loaded: list[tuple[str, RenderedForm]] = []
+        size = 0
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(
+                _rendered_columns()
+                .order_by(PublishedFormModel.published_at.desc(), PublishedFormModel.id.desc())
+                .execution_options(yield_per=500)
+            )
+            async for published_id, *columns in result:
+                form = rendered_form(*columns)
+                size += form.size
+                if len(loaded) >= self.cache.max_entries or (
+                    self.cache.max_bytes is not None and size > self.cache.max_bytes
+                ):
+                    break
+                loaded.append((published_id, form))
+        for published_id, form in reversed(loaded):
+            self.cache.put(published_id, form)
+        logger.info("Catalog preloaded %d forms (%d bytes)", len(self.cache), self.cache.size_bytes)
@@ -1,16 +1,24 @@
 from datetime import datetime
-from sqlalchemy import String, Text, DateTime
+from sqlalchemy import Index, LargeBinary, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import JSONB
-from shared.database import Base
+from shared.database import Base, UTCDateTime
 
 
 class PublishedFormModel(Base):
     __tablename__ = "published_forms"
+    __table_args__ = (Index("ix_published_forms_published_at_id", "published_at", "id"),)
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
-    draft_id: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    draft_id: Mapped[str] = mapped_column(String, nullable=False, unique=True, index=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    published_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    published_at: Mapped[datetime] = mapped_column(UTCDateTime, default=datetime.utcnow)
     renderable: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # Wire formats of the renderable, encoded once at publish time so catalog
+    # reads send stored bytes. The compressed copies are null for forms
+    # published before they existed, and renderable_br without brotli.
+    renderable_json: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    renderable_gzip: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    renderable_br: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    content_hash: Mapped[str] = mapped_column(String(64), nullable=False)
@@ -1,25 +1,97 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from shared.database import get_db
+import os
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.compression import SUPPORTED_ENCODINGS, negotiate_encoding
+from shared.database import get_async_db, get_read_db
+from shared.errors import InvalidCursorError
+from shared.http_cache import cache_control, encoded_etag, etag_matches
+from shared.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from contexts.app_services import AppServices, get_app_services
 from contexts.form_catalog.schemas import CatalogEntry
-from contexts.form_catalog.service import FormCatalogService
+from contexts.form_catalog.service import FormCatalogService, catalog_etag
 from shared.renderable_form import RenderableForm
 
 router = APIRouter(prefix="/catalog", tags=["Form Catalog"])
 
+CACHE_CONTROL = cache_control(
+    max_age=int(os.getenv("CATALOG_MAX_AGE_SECONDS", "60")),
+    stale_while_revalidate=int(os.getenv("CATALOG_STALE_WHILE_REVALIDATE_SECONDS", "300")),
+)
 
-def get_service(db: Session = Depends(get_db)) -> FormCatalogService:
-    return FormCatalogService(db)
+# Codings a published form may be stored in (RenderedForm.encoded), identity first.
+STORED_ENCODINGS = (None, "gzip", "br")
+
+
+def get_service(
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_read_db),
+    services: AppServices = Depends(get_app_services),
+) -> FormCatalogService:
+    return services.catalog_service(db, read_db=read_db)
+
+
+def _not_modified(etag: str, headers: dict | None = None) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL, **(headers or {})})
 
 
 @router.get("/forms", response_model=list[CatalogEntry])
-def list_forms(service: FormCatalogService = Depends(get_service)):
-    return service.list_catalog()
+async def list_forms(
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    name: str | None = None,
+    if_none_match: str | None = Header(default=None),
+    service: FormCatalogService = Depends(get_service),
+):
+    """Newest first. When more forms follow, the X-Next-Cursor header holds
+    the cursor to pass back for the next page."""
+    try:
+        entries, next_cursor = await service.list_catalog(limit, cursor, name)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    etag = catalog_etag(entries, next_cursor)
+    if etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return entries
+
+
+@router.get("/export")
+async def export_catalog(since: datetime | None = None, service: FormCatalogService = Depends(get_service)):
+    """NDJSON, one published form per line, oldest first. Pass the last
+    line's published_at as `since` to fetch only newer forms."""
+    return StreamingResponse(service.export_catalog(since), media_type="application/x-ndjson")
 
 
 @router.get("/forms/{published_id}", response_model=RenderableForm)
-def get_form(published_id: str, service: FormCatalogService = Depends(get_service)):
-    form = service.get_renderable(published_id)
-    if not form:
+async def get_form(
+    published_id: str,
+    if_none_match: str | None = Header(default=None),
+    accept_encoding: str | None = Header(default=None),
+    service: FormCatalogService = Depends(get_service),
+):
+    if if_none_match:
+        etag = await service.get_form_etag(published_id)
+        if etag is not None:
+            # Each stored coding has its own tag; a client revalidates the one it holds.
+            for encoding in STORED_ENCODINGS:
+                if etag_matches(if_none_match, encoded_etag(etag, encoding)):
+                    return _not_modified(encoded_etag(etag, encoding), {"Vary": "Accept-Encoding"})
+
+    # The body is a RenderableForm serialized and compressed at publish time;
+    # returning a Response skips response_model validation and re-encoding.
+    form = await service.get_rendered_form(published_id)
+    if form is None:
         raise HTTPException(status_code=404, detail="Published form not found")
-    return form
+    encoding = negotiate_encoding(
+        accept_encoding, [e for e in SUPPORTED_ENCODINGS if form.encoded(e) is not None],
+    )
+    headers = {"ETag": encoded_etag(form.etag, encoding), "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=form.encoded(encoding), media_type="application/json", headers=headers)
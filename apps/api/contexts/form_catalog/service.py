@@ -1,70 +1,248 @@
 from __future__ import annotations
+import hashlib
+import os
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+from typing import AsyncIterator
+from sqlalchemy import Text, cast, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from contexts.form_catalog.cache import RenderableCache, RenderedForm, get_renderable_cache
 from contexts.form_catalog.models import PublishedFormModel
 from contexts.form_catalog.schemas import PublishedForm, CatalogEntry
 from contexts.form_catalog.translator import CatalogTranslator
 from contexts.form_design.schemas import FormDraft
+from shared.compression import SUPPORTED_ENCODINGS, compress
+from shared.database import ReadSessionLocal
+from shared.http_cache import make_etag
+from shared.pagination import DEFAULT_PAGE_SIZE, name_pattern, page, paginate
 from shared.renderable_form import RenderableForm
 
+# Rows fetched per round trip from the export's server-side cursor.
+EXPORT_BATCH_SIZE = int(os.getenv("CATALOG_EXPORT_BATCH_SIZE", "500"))
+
+
+# Stored copies of generated and seeded forms are read far more often than
+# they are written, so they use strong settings.
+GZIP_LEVEL = int(os.getenv("CATALOG_GZIP_LEVEL", "9"))
+BROTLI_QUALITY = int(os.getenv("CATALOG_BROTLI_QUALITY", "9"))
+# Every autosave of a draft republishes it, on the request path, so those
+# copies use fast settings: ~1.6 ms instead of ~27 ms for 1,000 fields.
+AUTOSAVE_GZIP_LEVEL = int(os.getenv("CATALOG_AUTOSAVE_GZIP_LEVEL", "1"))
+AUTOSAVE_BROTLI_QUALITY = int(os.getenv("CATALOG_AUTOSAVE_BROTLI_QUALITY", "4"))
+
+# What the read path needs of a published form, in rendered_form's order.
+RENDERED_COLUMNS = (
+    PublishedFormModel.published_at,
+    PublishedFormModel.content_hash,
+    PublishedFormModel.renderable_json,
+    PublishedFormModel.renderable_gzip,
+    PublishedFormModel.renderable_br,
+)
+
+
+def _form_etag(content_hash: str) -> str:
+    # Tag of the identity body; encoded bodies carry encoded_etag() variants of it.
+    return f'"{content_hash}"'
+
+
+def catalog_etag(entries: list[CatalogEntry], next_cursor: str | None) -> str:
+    """Tag of one catalog page, derived from the rows it lists. Republishing
+    bumps published_at, so any change to a listed entry changes the tag."""
+    return make_etag("catalog", next_cursor or "", *(f"{e.id}@{e.published_at}" for e in entries))
+
+
+def encode_renderable(
+    renderable: RenderableForm, gzip_level: int = GZIP_LEVEL, brotli_quality: int = BROTLI_QUALITY,
+) -> dict:
+    """The renderable's published_forms columns: the JSONB document plus its
+    compact JSON, compressed copies and content hash."""
+    body = renderable.model_dump_json().encode()
+    return dict(
+        renderable=renderable.model_dump(),
+        renderable_json=body,
+        renderable_gzip=compress(body, "gzip", gzip_level),
+        renderable_br=compress(body, "br", brotli_quality) if "br" in SUPPORTED_ENCODINGS else None,
+        content_hash=hashlib.sha256(body).hexdigest(),
+    )
+
+
+def rendered_form(
+    published_at: datetime, content_hash: str, body: bytes, body_gzip: bytes | None, body_br: bytes | None,
+) -> RenderedForm:
+    """Cache entry for a published form, from its RENDERED_COLUMNS."""
+    return RenderedForm(
+        published_at=published_at,
+        etag=_form_etag(content_hash),
+        body=body,
+        body_gzip=body_gzip,
+        body_br=body_br,
+    )
+
 
 class FormCatalogService:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: AsyncSession,
+        translator: CatalogTranslator | None = None,
+        renderable_cache: RenderableCache | None = None,
+        read_db: AsyncSession | None = None,
+    ):
         self.db = db
-        self.translator = CatalogTranslator()
+        # Catalog reads may lag the primary by replication delay; writes never use this.
+        self.read_db = read_db or db
+        self.translator = translator or CatalogTranslator()
+        self.renderable_cache = renderable_cache if renderable_cache is not None else get_renderable_cache()
 
-    def publish(self, draft: FormDraft) -> PublishedForm:
+    async def publish(
+        self, draft: FormDraft, commit: bool = True, autosave: bool = False,
+    ) -> tuple[PublishedForm, RenderedForm]:
+        """Upserts the draft's published form, with its wire formats, in one
+        INSERT ... ON CONFLICT (draft_id) DO UPDATE ... RETURNING. With
+        commit=False the write joins the caller's transaction, and the caller
+        calls cache_published once it has committed. autosave=True compresses
+        with the fast AUTOSAVE_* settings."""
         renderable = self.translator.to_renderable(draft)
+        if autosave:
+            encoded = encode_renderable(renderable, AUTOSAVE_GZIP_LEVEL, AUTOSAVE_BROTLI_QUALITY)
+        else:
+            encoded = encode_renderable(renderable)
+        values = dict(
+            id=str(uuid.uuid4()),
+            draft_id=draft.id,
+            name=draft.name,
+            description=draft.description,
+            published_at=datetime.now(timezone.utc),
+            **encoded,
+        )
+        stmt = insert(PublishedFormModel).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PublishedFormModel.draft_id],
+            set_={k: stmt.excluded[k] for k in ("name", "description", "published_at", *encoded)},
+        ).returning(PublishedFormModel.id, PublishedFormModel.published_at)
+        row = (await self.db.execute(stmt)).one()
 
-        # Upsert: replace existing published form for this draft
-        existing = self.db.query(PublishedFormModel).filter_by(draft_id=draft.id).first()
-        now = datetime.now(timezone.utc)
+        published = PublishedForm(
+            id=row.id,
+            draft_id=draft.id,
+            name=draft.name,
+            description=draft.description,
+            published_at=row.published_at.isoformat(),
+            renderable=renderable,
+        )
+        rendered = rendered_form(
+            row.published_at, encoded["content_hash"], encoded["renderable_json"],
+            encoded["renderable_gzip"], encoded["renderable_br"],
+        )
+        if commit:
+            await self.db.commit()
+            self.cache_published(published.id, rendered)
+        return published, rendered
 
-        if existing:
-            existing.name = draft.name
-            existing.description = draft.description
-            existing.published_at = now
-            existing.renderable = renderable.model_dump()
-            self.db.commit()
-            self.db.refresh(existing)
-            model = existing
-        else:
-            model = PublishedFormModel(
+    def cache_published(self, published_id: str, form: RenderedForm) -> None:
+        """Primes the renderable cache with a committed publish. Priming rather
+        than evicting means a concurrent read that loaded the previous row
+        can't put it back (see RenderableCache.put)."""
+        if self.renderable_cache is not None:
+            self.renderable_cache.put(published_id, form)
+
+    def publish_new(self, drafts: list[FormDraft]) -> None:
+        """Stages catalog entries for drafts that have never been published,
+        skipping the per-draft upsert lookup. The caller commits."""
+        now = datetime.now(timezone.utc)
+        self.db.add_all([
+            PublishedFormModel(
                 id=str(uuid.uuid4()),
                 draft_id=draft.id,
                 name=draft.name,
                 description=draft.description,
                 published_at=now,
-                renderable=renderable.model_dump(),
+                **encode_renderable(self.translator.to_renderable(draft)),
             )
-            self.db.add(model)
-            self.db.commit()
-            self.db.refresh(model)
-
-        return PublishedForm(
-            id=model.id,
-            draft_id=model.draft_id,
-            name=model.name,
-            description=model.description,
-            published_at=model.published_at.isoformat(),
-            renderable=renderable,
-        )
+            for draft in drafts
+        ])
 
-    def list_catalog(self) -> list[CatalogEntry]:
-        models = self.db.query(PublishedFormModel).order_by(PublishedFormModel.published_at.desc()).all()
+    async def list_catalog(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        name: str | None = None,
+    ) -> tuple[list[CatalogEntry], str | None]:
+        """Newest-first page of catalog entries and the cursor of the next page.
+        Only summary columns are selected; the renderable JSONB is never read."""
+        stmt = select(
+            PublishedFormModel.id,
+            PublishedFormModel.name,
+            PublishedFormModel.description,
+            PublishedFormModel.published_at,
+        )
+        if name:
+            stmt = stmt.where(PublishedFormModel.name.ilike(name_pattern(name), escape="\\"))
+        stmt = paginate(stmt, PublishedFormModel.published_at, PublishedFormModel.id, limit, cursor)
+        rows, next_cursor = page((await self.read_db.execute(stmt)).all(), limit, "published_at")
         return [
             CatalogEntry(
-                id=m.id,
-                name=m.name,
-                description=m.description,
-                published_at=m.published_at.isoformat(),
+                id=r.id,
+                name=r.name,
+                description=r.description,
+                published_at=r.published_at.isoformat(),
             )
-            for m in models
-        ]
+            for r in rows
+        ], next_cursor
+
+    async def export_catalog(self, since: datetime | None = None) -> AsyncIterator[bytes]:
+        """Every published form as NDJSON, oldest first, optionally only those
+        published after `since`. Postgres renders each line and the stored
+        renderable is passed through as-is, so nothing is parsed in Python and
+        memory stays flat. Runs on its own session because the stream outlives
+        the request's."""
+        line = func.json_build_object(
+            "id", PublishedFormModel.id,
+            "draft_id", PublishedFormModel.draft_id,
+            "name", PublishedFormModel.name,
+            "description", PublishedFormModel.description,
+            "published_at", PublishedFormModel.published_at,
+            "renderable", PublishedFormModel.renderable,
+        )
+        stmt = select(cast(line, Text)).order_by(PublishedFormModel.published_at, PublishedFormModel.id)
+        if since is not None:
+            stmt = stmt.where(PublishedFormModel.published_at > since)
+
+        async with ReadSessionLocal() as db:
+            result = await db.stream_scalars(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for partition in result.partitions():
+                yield "".join(f"{row}\n" for row in partition).encode()
+
+    async def get_form_etag(self, published_id: str) -> str | None:
+        """ETag of a published form, read from the cache or from the stored
+        content hash alone, without loading the renderable."""
+        if self.renderable_cache is not None:
+            cached = self.renderable_cache.get(published_id)
+            if cached is not None:
+                return cached.etag
+        content_hash = await self.read_db.scalar(
+            select(PublishedFormModel.content_hash).filter_by(id=published_id)
+        )
+        if content_hash is None:
+            return None
+        return _form_etag(content_hash)
+
+    async def get_rendered_form(self, published_id: str) -> RenderedForm | None:
+        """Serialized RenderableForm for the catalog read path, in every
+        stored coding. Nothing is parsed or encoded in Python, and cache hits
+        skip the database too."""
+        cache = self.renderable_cache
+        if cache is not None:
+            cached = cache.get(published_id)
+            if cached is not None:
+                return cached
 
-    def get_renderable(self, published_id: str) -> RenderableForm | None:
-        model = self.db.get(PublishedFormModel, published_id)
-        if not model:
+        row = (await self.read_db.execute(
+            select(*RENDERED_COLUMNS).where(PublishedFormModel.id == published_id)
+        )).first()
+        if row is None:
             return None
-        return RenderableForm(**model.renderable)
+        form = rendered_form(*row)
+        if cache is not None:
+            cache.put(published_id, form)
+        return form
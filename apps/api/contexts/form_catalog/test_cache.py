@@ -0,0 +1,145 @@
+"""Unit tests for the renderable cache — TTL, LRU and publish ordering."""
+from datetime import datetime, timedelta
+
+from contexts.form_catalog.cache import RenderableCache, RenderedForm
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _form(body: bytes, published_at: datetime = T0) -> RenderedForm:
+    return RenderedForm(published_at=published_at, etag='"etag"', body=body)
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = RenderableCache(ttl_seconds=10, max_entries=10, clock=clock)
+    cache.put("a", _form(b"{}"))
+
+    clock.now = 9.9
+    assert cache.get("a").body == b"{}"
+    clock.now = 10.0
+    assert cache.get("a") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RenderableCache(ttl_seconds=60, max_entries=2)
+    cache.put("a", _form(b"a"))
+    cache.put("b", _form(b"b"))
+    cache.get("a")
+    cache.put("c", _form(b"c"))
+
+    assert cache.get("a").body == b"a"
+    assert cache.get("b") is None
+    assert cache.get("c").body == b"c"
+
+
+def test_older_publish_never_replaces_newer_entry():
+    cache = RenderableCache(ttl_seconds=60, max_entries=10)
+    cache.put("a", _form(b"new", T0 + timedelta(seconds=1)))
+    cache.put("a", _form(b"old"))
+
+    assert cache.get("a").body == b"new"
+
+
+def test_newer_publish_replaces_entry():
+    cache = RenderableCache(ttl_seconds=60, max_entries=10)
+    cache.put("a", _form(b"old"))
+    cache.put("a", _form(b"new", T0 + timedelta(seconds=1)))
+
+    assert cache.get("a").body == b"new"
+
+
+def test_invalidate_drops_entry():
+    cache = RenderableCache(ttl_seconds=60, max_entries=10)
+    cache.put("a", _form(b"{}"))
+    cache.invalidate("a")
+
+    assert cache.get("a") is None
+
+
+def test_byte_bound_evicts_least_recently_used():
+    cache = RenderableCache(ttl_seconds=60, max_entries=10, max_bytes=5)
+    cache.put("a", _form(b"aa"))
+    cache.put("b", _form(b"bb"))
+    cache.put("c", _form(b"cc"))
+
+    assert cache.get("a") is None
+    assert cache.size_bytes == 4
+
+
+def test_replacing_and_invalidating_keep_size_in_step():
+    cache = RenderableCache(ttl_seconds=60, max_entries=10)
+    cache.put("a", _form(b"old"))
+    cache.put("a", _form(b"newer", T0 + timedelta(seconds=1)))
+    assert cache.size_bytes == 5
+
+    cache.invalidate("a")
+    assert cache.size_bytes == 0
+
+
+def test_fence_drops_older_entry_and_refuses_older_puts():
+    cache = RenderableCache(ttl_seconds=60, max_entries=10)
+    cache.put("a", _form(b"old"))
+    cache.fence("a", T0 + timedelta(seconds=1))
+    assert cache.get("a") is None
+
+    cache.put("a", _form(b"old"))                           # e.g. read from a lagging replica
+    assert cache.get("a") is None
+    cache.put("a", _form(b"new", T0 + timedelta(seconds=1)))
+    assert cache.get("a").body == b"new"
+
+
+def test_fence_never_moves_back():
+    cache = RenderableCache(ttl_seconds=60, max_entries=10)
+    cache.fence("a", T0 + timedelta(seconds=2))
+    cache.fence("a", T0 + timedelta(seconds=1))
+    cache.put("a", _form(b"mid", T0 + timedelta(seconds=1)))
+
+    assert cache.get("a") is None
+
+
+def test_deleted_forms_are_never_stored_again():
+    cache = RenderableCache(ttl_seconds=60, max_entries=10)
+    cache.put("a", _form(b"{}"))
+    cache.fence("a", None)
+    cache.put("a", _form(b"{}", T0 + timedelta(days=1)))
+
+    assert cache.get("a") is None
+
+
+def test_fences_are_bounded_by_max_entries():
+    cache = RenderableCache(ttl_seconds=60, max_entries=2)
+    for published_id in "abc":
+        cache.fence(published_id, None)
+    cache.put("a", _form(b"a"))
+    cache.put("c", _form(b"c"))
+
+    assert cache.get("a").body == b"a"
+    assert cache.get("c") is None
+
+
+def test_clear_drops_everything():
+    cache = RenderableCache(ttl_seconds=60, max_entries=10)
+    cache.put("a", _form(b"{}"))
+    cache.clear()
+
+    assert cache.get("a") is None
+    assert len(cache) == 0 and cache.size_bytes == 0
+
+
+def test_size_counts_every_stored_coding():
+    cache = RenderableCache(ttl_seconds=60, max_entries=10, max_bytes=6)
+    cache.put("a", RenderedForm(published_at=T0, etag='"a"', body=b"aaaa", body_gzip=b"aa"))
+    assert cache.size_bytes == 6
+
+    cache.put("b", _form(b"b"))
+    assert cache.get("a") is None
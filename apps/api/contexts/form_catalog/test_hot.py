@@ -0,0 +1,77 @@
+"""Unit tests for how the hot catalog applies published_forms notifications."""
+import asyncio
+from datetime import timedelta
+
+from contexts.form_catalog.cache import RenderableCache
+from contexts.form_catalog.hot import CatalogListener
+from contexts.form_catalog.test_cache import T0, _form
+
+
+class RecordingListener(CatalogListener):
+    """Records reloads instead of querying the database."""
+
+    def __init__(self, cache: RenderableCache):
+        super().__init__(cache, preload=False, dsn="postgresql://unused")
+        self.refreshed: list[str] = []
+
+    async def _refresh(self, published_id: str) -> None:
+        self.refreshed.append(published_id)
+
+
+def _apply(listener: CatalogListener, notification: dict) -> None:
+    async def run():
+        listener.apply(notification)
+        await asyncio.gather(*listener._refreshes)
+    asyncio.run(run())
+
+
+def _cache() -> RenderableCache:
+    cache = RenderableCache(ttl_seconds=60, max_entries=10)
+    cache.put("a", _form(b"{}"))
+    return cache
+
+
+def test_delete_evicts_form():
+    listener = RecordingListener(_cache())
+    _apply(listener, {"op": "DELETE", "id": "a"})
+
+    assert listener.cache.get("a") is None
+    assert listener.refreshed == []
+
+    listener.cache.put("a", _form(b"{}"))                  # a read that raced the delete
+    assert listener.cache.get("a") is None
+
+
+def test_republish_of_cached_form_evicts_and_reloads_it():
+    listener = RecordingListener(_cache())
+    _apply(listener, {"op": "UPDATE", "id": "a", "published_at": (T0 + timedelta(seconds=1)).isoformat()})
+
+    assert listener.cache.get("a") is None
+    assert listener.refreshed == ["a"]
+
+
+def test_notification_of_own_publish_is_ignored():
+    listener = RecordingListener(_cache())
+    _apply(listener, {"op": "UPDATE", "id": "a", "published_at": T0.isoformat()})
+
+    assert listener.cache.get("a").body == b"{}"
+    assert listener.refreshed == []
+
+
+def test_uncached_forms_are_left_to_load_on_first_read():
+    listener = RecordingListener(_cache())
+    _apply(listener, {"op": "INSERT", "id": "b", "published_at": T0.isoformat()})
+
+    assert listener.refreshed == []
+
+
+def test_republish_of_uncached_form_refuses_stale_fill():
+    listener = RecordingListener(_cache())
+    _apply(listener, {"op": "UPDATE", "id": "b", "published_at": (T0 + timedelta(seconds=1)).isoformat()})
+
+    # A cache miss filled from a replica that has not replayed the republish yet.
+    listener.cache.put("b", _form(b"old"))
+    assert listener.cache.get("b") is None
+    listener.cache.put("b", _form(b"new", T0 + timedelta(seconds=1)))
+    assert listener.cache.get("b").body == b"new"
+    assert listener.refreshed == []
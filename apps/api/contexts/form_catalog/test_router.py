@@ -0,0 +1,101 @@
+"""Router tests for conditional catalog reads — page and per-coding form ETags, and 304s."""
+import gzip
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from contexts.form_catalog.cache import RenderedForm
+from contexts.form_catalog.router import get_service, router
+from contexts.form_catalog.schemas import CatalogEntry
+
+
+class FakeCatalogService:
+    """Serves a fixed catalog, newest first, counting list queries, and one
+    form stored as identity and gzip."""
+
+    def __init__(self, entries: list[CatalogEntry]):
+        self.entries = entries
+        self.queries = 0
+        self.form = RenderedForm(
+            published_at=datetime(2026, 1, 1), etag='"abc"', body=b'{"id": "f1"}',
+            body_gzip=gzip.compress(b'{"id": "f1"}'),
+        )
+
+    async def get_form_etag(self, published_id):
+        return self.form.etag
+
+    async def get_rendered_form(self, published_id):
+        return self.form
+
+    async def list_catalog(self, limit, cursor=None, name=None):
+        self.queries += 1
+        next_cursor = "next" if len(self.entries) > limit else None
+        return self.entries[:limit], next_cursor
+
+
+def _entry(id: str, published_at: str) -> CatalogEntry:
+    return CatalogEntry(id=id, name=f"Form {id}", published_at=published_at)
+
+
+def _client(service: FakeCatalogService) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_service] = lambda: service
+    return TestClient(app)
+
+
+def test_matching_if_none_match_is_304_after_one_query():
+    service = FakeCatalogService([_entry("b", "2026-01-02T00:00:00"), _entry("a", "2026-01-01T00:00:00")])
+    client = _client(service)
+    etag = client.get("/catalog/forms").headers["ETag"]
+
+    response = client.get("/catalog/forms", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert service.queries == 2
+
+
+def test_republished_entry_changes_page_etag():
+    service = FakeCatalogService([_entry("b", "2026-01-02T00:00:00"), _entry("a", "2026-01-01T00:00:00")])
+    client = _client(service)
+    etag = client.get("/catalog/forms").headers["ETag"]
+
+    service.entries = [_entry("a", "2026-01-03T00:00:00"), _entry("b", "2026-01-02T00:00:00")]
+    response = client.get("/catalog/forms", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_pages_have_distinct_etags():
+    service = FakeCatalogService([_entry("b", "2026-01-02T00:00:00"), _entry("a", "2026-01-01T00:00:00")])
+    client = _client(service)
+
+    first = client.get("/catalog/forms", params={"limit": 1})
+    whole = client.get("/catalog/forms")
+
+    assert first.headers["X-Next-Cursor"] == "next"
+    assert first.headers["ETag"] != whole.headers["ETag"]
+
+
+def test_each_stored_coding_has_its_own_form_etag():
+    client = _client(FakeCatalogService([]))
+
+    identity = client.get("/catalog/forms/f1", headers={"Accept-Encoding": "identity"})
+    encoded = client.get("/catalog/forms/f1", headers={"Accept-Encoding": "gzip"})
+
+    assert identity.headers["ETag"] == '"abc"'
+    assert encoded.headers["Content-Encoding"] == "gzip"
+    assert encoded.headers["ETag"] == '"abc-gzip"'
+
+
+def test_if_none_match_revalidates_every_coding():
+    client = _client(FakeCatalogService([]))
+
+    for etag in ('"abc"', '"abc-gzip"', 'W/"abc-gzip"'):
+        response = client.get("/catalog/forms/f1", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag.removeprefix("W/")
+    assert client.get("/catalog/forms/f1", headers={"If-None-Match": '"other"'}).status_code == 200
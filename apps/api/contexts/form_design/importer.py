@@ -0,0 +1,196 @@
+"""Bulk import of FormDrafts from NDJSON, e.g. when migrating from another builder.
+
+Lines are parsed and validated in chunks; each chunk's drafts, their base
+revisions and published forms are written with multi-row INSERTs in a single
+transaction.
+Invalid lines (including lines that are not UTF-8), drafts whose id already
+exists and chunks the database rejects are reported by line number and never
+abort the rest of the import.
+"""
+import logging
+import os
+import uuid
+from datetime import datetime, timezone
+from typing import AsyncIterable, Iterable
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from contexts.form_catalog.models import PublishedFormModel
+from contexts.form_catalog.service import encode_renderable
+from contexts.form_catalog.translator import CatalogTranslator
+from contexts.form_design.models import FormDraftModel, FormDraftRevisionModel
+from contexts.form_design.revisions import draft_document
+from contexts.form_design.schemas import DraftImportResult, FormDraft, ImportLineError
+from contexts.form_design.validator import FormDraftValidator
+from shared.errors import DraftValidationError, FieldValidationError, field_errors
+
+logger = logging.getLogger(__name__)
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+
+
+class DraftImporter:
+    def __init__(
+        self,
+        db: AsyncSession,
+        validator: FormDraftValidator | None = None,
+        catalog_translator: CatalogTranslator | None = None,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ):
+        self.db = db
+        self.validator = validator or FormDraftValidator()
+        self.catalog_translator = catalog_translator or CatalogTranslator()
+        self.chunk_size = chunk_size
+
+    async def import_lines(
+        self, lines: AsyncIterable[str | bytes] | Iterable[str | bytes],
+    ) -> DraftImportResult:
+        """Imports one JSON FormDraft per line; blank lines are skipped. Line
+        numbers in the result are 1-based."""
+        result = DraftImportResult()
+        chunk: list[tuple[int, FormDraft]] = []
+
+        async for number, line in _numbered(lines):
+            if not line.strip():
+                continue
+            draft = self._parse(number, line, result)
+            if draft is None:
+                continue
+            chunk.append((number, draft))
+            if len(chunk) >= self.chunk_size:
+                await self._load(chunk, result)
+                chunk = []
+
+        if chunk:
+            await self._load(chunk, result)
+        result.errors.sort(key=lambda e: e.line)
+        result.failed = len(result.errors)
+        return result
+
+    def _parse(self, number: int, line: str | bytes, result: DraftImportResult) -> FormDraft | None:
+        try:
+            draft = FormDraft.model_validate_json(line)
+        except ValidationError as e:
+            result.errors.append(ImportLineError(line=number, errors=field_errors(e)))
+            return None
+        try:
+            self.validator.validate(draft)
+        except DraftValidationError as e:
+            result.errors.append(ImportLineError(line=number, draft_id=draft.id, errors=e.errors))
+            return None
+        return draft
+
+    async def _load(self, chunk: list[tuple[int, FormDraft]], result: DraftImportResult) -> None:
+        """Writes one chunk in one transaction. Drafts whose id is already taken
+        are skipped via ON CONFLICT DO NOTHING and reported per line. A chunk
+        the database rejects is rolled back and reported line by line, and
+        later chunks still load."""
+        errors: list[ImportLineError] = []
+        try:
+            imported = await self._write(chunk, errors)
+        except SQLAlchemyError as e:
+            await self.db.rollback()
+            logger.exception("Import of lines %d-%d failed", chunk[0][0], chunk[-1][0])
+            reason = str(getattr(e, "orig", None) or e).splitlines()[0]
+            message = f"Not imported; the database rejected its chunk: {reason}"
+            result.errors.extend(
+                ImportLineError(line=number, draft_id=draft.id, errors=[
+                    FieldValidationError(field="draft", message=message),
+                ])
+                for number, draft in chunk
+            )
+            return
+        result.errors.extend(errors)
+        result.imported += imported
+
+    async def _write(self, chunk: list[tuple[int, FormDraft]], errors: list[ImportLineError]) -> int:
+        stmt = (
+            pg_insert(FormDraftModel)
+            .on_conflict_do_nothing(index_elements=[FormDraftModel.id])
+            .returning(FormDraftModel.id)
+        )
+        inserted = set((await self.db.scalars(stmt, [_draft_row(d) for _, d in chunk])).all())
+
+        now = datetime.now(timezone.utc)
+        published = []
+        revisions = []
+        for number, draft in chunk:
+            if draft.id not in inserted:
+                errors.append(ImportLineError(line=number, draft_id=draft.id, errors=[
+                    FieldValidationError(field="id", message=f"Draft '{draft.id}' already exists."),
+                ]))
+                continue
+            # A repeated id within the chunk is inserted once; later lines are duplicates.
+            inserted.discard(draft.id)
+            revisions.append(dict(
+                draft_id=draft.id,
+                version=draft.version,
+                snapshot=draft_document(draft),
+                created_at=datetime.fromisoformat(draft.updated_at),
+            ))
+            published.append(dict(
+                id=str(uuid.uuid4()),
+                draft_id=draft.id,
+                name=draft.name,
+                description=draft.description,
+                published_at=now,
+                **encode_renderable(self.catalog_translator.to_renderable(draft)),
+            ))
+
+        if published:
+            await self.db.execute(insert(FormDraftRevisionModel), revisions)
+            # A catalog entry can outlive its draft (deleted, or left by an
+            # earlier partial import); replace it as a republish would.
+            publish = pg_insert(PublishedFormModel)
+            publish = publish.on_conflict_do_update(
+                index_elements=[PublishedFormModel.draft_id],
+                set_={k: publish.excluded[k] for k in published[0] if k not in ("id", "draft_id")},
+            )
+            await self.db.execute(publish, published)
+        await self.db.commit()
+        return len(published)
+
+
+def _draft_row(draft: FormDraft) -> dict:
+    return dict(
+        id=draft.id,
+        name=draft.name,
+        description=draft.description,
+        prompt=draft.prompt,
+        version=draft.version,
+        status=draft.status,
+        fields=[f.model_dump() for f in draft.fields],
+        layout=draft.layout.model_dump(),
+        actions=[a.model_dump() for a in draft.actions],
+        css_overrides=draft.css_overrides,
+        created_at=datetime.fromisoformat(draft.created_at),
+        updated_at=datetime.fromisoformat(draft.updated_at),
+    )
+
+
+async def _numbered(lines: AsyncIterable[str | bytes] | Iterable[str | bytes]):
+    number = 0
+    if hasattr(lines, "__aiter__"):
+        async for line in lines:
+            number += 1
+            yield number, line
+    else:
+        for line in lines:
+            number += 1
+            yield number, line
+
+
+async def split_lines(chunks: AsyncIterable[bytes]) -> AsyncIterable[bytes]:
+    """Reassembles lines from an arbitrarily chunked byte stream. Lines stay
+    bytes and are decoded by the JSON parser, so a line that is not valid
+    UTF-8 is reported like any other malformed line."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        for line in complete:
+            yield line
+    if buffer:
+        yield buffer
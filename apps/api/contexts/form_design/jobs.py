@@ -0,0 +1,231 @@
+"""Postgres-backed job queue for generation work.
+
+Jobs live in the generation_jobs table and are claimed with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of API processes or
+standalone workers can drain the same queue without a broker. Finished jobs
+are deleted JOB_RETENTION_SECONDS after they finish.
+"""
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from contexts.form_design.models import GenerationJobModel
+from contexts.form_design.schemas import (
+    GenerationJob, GenerationRequest, BatchGenerationRequest,
+)
+from contexts.app_services import AppServices
+from shared.database import AsyncSessionLocal, async_engine
+from shared.errors import DraftValidationError, FieldValidationError, GenerationOutputError
+
+logger = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1.0"))
+# A running job whose worker has not finished it within the lease is assumed
+# lost and handed to another worker, up to JOB_MAX_ATTEMPTS times.
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "600"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+# Finished jobs, whose result holds the full draft JSON, are kept this long
+# for GET /design/jobs/{id}.
+JOB_RETENTION_SECONDS = float(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+_PRUNE_INTERVAL_SECONDS = 3600
+
+
+class JobQueue:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue_generate(self, request: GenerationRequest) -> GenerationJob:
+        return await self._enqueue("generate", request.model_dump())
+
+    async def enqueue_batch(self, request: BatchGenerationRequest) -> GenerationJob:
+        return await self._enqueue("batch", request.model_dump())
+
+    async def get(self, job_id: str) -> GenerationJob | None:
+        model = await self.db.get(GenerationJobModel, job_id)
+        return self._to_schema(model) if model else None
+
+    async def _enqueue(self, kind: str, payload: dict) -> GenerationJob:
+        model = GenerationJobModel(
+            id=str(uuid.uuid4()),
+            kind=kind,
+            status="pending",
+            payload=payload,
+            attempts=0,
+            created_at=datetime.now(timezone.utc),
+        )
+        self.db.add(model)
+        await self.db.commit()
+        return self._to_schema(model)
+
+    def _to_schema(self, model: GenerationJobModel) -> GenerationJob:
+        result = model.result or {}
+        return GenerationJob(
+            id=model.id,
+            kind=model.kind,
+            status=model.status,
+            attempts=model.attempts,
+            created_at=model.created_at.isoformat(),
+            started_at=model.started_at.isoformat() if model.started_at else None,
+            finished_at=model.finished_at.isoformat() if model.finished_at else None,
+            draft=result if model.kind == "generate" and result else None,
+            batch=result if model.kind == "batch" and result else None,
+            errors=model.errors or [],
+        )
+
+
+class JobWorkerPool:
+    """Runs the generate → translate → validate → save → publish pipeline for
+    queued jobs on a fixed number of asyncio tasks."""
+
+    def __init__(self, services: AppServices, workers: int = JOB_WORKERS, poll_interval: float = JOB_POLL_INTERVAL_SECONDS):
+        self.services = services
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._prune_periodically()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claim = await self._claim()
+                if claim is not None:
+                    await self._execute(*claim)
+                    continue
+            except Exception:
+                # The job, if any, stays running and is retried once its lease expires.
+                logger.exception("Generation job worker failed")
+            await asyncio.sleep(self.poll_interval)
+
+    async def _claim(self) -> tuple[str, int] | None:
+        """Id and attempt number of the oldest pending job, or of a running
+        job whose lease has expired, now marked running by this worker.
+        Expired jobs that have used up their attempts are marked failed on
+        the way."""
+        while True:
+            now = datetime.now(timezone.utc)
+            lease_expired = now - timedelta(seconds=JOB_LEASE_SECONDS)
+            async with AsyncSessionLocal() as db:
+                stmt = (
+                    select(GenerationJobModel)
+                    .where(or_(
+                        GenerationJobModel.status == "pending",
+                        and_(
+                            GenerationJobModel.status == "running",
+                            GenerationJobModel.started_at < lease_expired.replace(tzinfo=None),
+                        ),
+                    ))
+                    .order_by(GenerationJobModel.created_at)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+                job = await db.scalar(stmt)
+                if job is None:
+                    return None
+                claimed = _take(job, now)
+                await db.commit()
+                if claimed:
+                    return job.id, job.attempts
+
+    async def _prune_periodically(self) -> None:
+        while True:
+            try:
+                await self._prune()
+            except Exception:
+                logger.exception("Failed to prune finished generation jobs")
+            await asyncio.sleep(_PRUNE_INTERVAL_SECONDS)
+
+    async def _prune(self) -> None:
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=JOB_RETENTION_SECONDS)
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(GenerationJobModel).where(
+                    GenerationJobModel.status.in_(("completed", "failed")),
+                    GenerationJobModel.finished_at < cutoff.replace(tzinfo=None),
+                )
+            )
+            await db.commit()
+        if result.rowcount:
+            logger.info("Pruned %d finished generation jobs", result.rowcount)
+
+    async def _execute(self, job_id: str, attempt: int) -> None:
+        """Runs one claimed attempt of a job. Its drafts and the job's final
+        status are committed together, and only while the job still carries
+        this claim: a run whose lease expired and was claimed again is
+        discarded, so it neither duplicates drafts nor overwrites the status."""
+        async with AsyncSessionLocal() as db:
+            job = await db.get(GenerationJobModel, job_id)
+        result: dict | None = None
+        errors: list[FieldValidationError] = []
+        async with async_engine.connect() as connection, connection.begin() as transaction:
+            # The service's own commits and rollbacks only end savepoints.
+            db = AsyncSession(
+                bind=connection, join_transaction_mode="create_savepoint", autoflush=False, expire_on_commit=False,
+            )
+            service = self.services.design_service(db)
+            try:
+                if job.kind == "generate":
+                    draft = await service.generate(GenerationRequest(**job.payload))
+                    result = draft.model_dump(mode="json")
+                else:
+                    batch = await service.generate_batch(BatchGenerationRequest(**job.payload).requests)
+                    result = batch.model_dump(mode="json")
+            except (GenerationOutputError, DraftValidationError) as e:
+                errors = e.errors
+            except Exception as exc:
+                logger.exception("Generation job %s failed", job_id)
+                errors = [FieldValidationError(field="job", message=str(exc))]
+                await db.rollback()
+
+            finished = await db.scalar(
+                update(GenerationJobModel)
+                .where(
+                    GenerationJobModel.id == job_id,
+                    GenerationJobModel.status == "running",
+                    GenerationJobModel.attempts == attempt,
+                )
+                .values(
+                    status="failed" if errors else "completed",
+                    result=result,
+                    errors=[e.model_dump() for e in errors] or None,
+                    finished_at=datetime.now(timezone.utc),
+                )
+                .returning(GenerationJobModel.id)
+            )
+            if finished is None:
+                logger.warning("Generation job %s was claimed again after its lease expired; discarding attempt %d",
+                               job_id, attempt)
+                await transaction.rollback()
+            else:
+                await db.commit()
+            await db.close()
+
+
+def _take(job: GenerationJobModel, now: datetime) -> bool:
+    """Marks a claimable job running for another attempt, or, when it is a
+    lost job that has used up JOB_MAX_ATTEMPTS, failed. Returns whether the
+    job is to be executed."""
+    if job.status == "running" and job.attempts >= JOB_MAX_ATTEMPTS:
+        job.status = "failed"
+        job.errors = [FieldValidationError(
+            field="job",
+            message=f"Job was not finished within {JOB_LEASE_SECONDS:g}s in any of {job.attempts} attempts.",
+        ).model_dump()]
+        job.finished_at = now
+        return False
+    job.status = "running"
+    job.started_at = now
+    job.attempts += 1
+    return True
@@ -0,0 +1,155 @@
+"""RFC 6902 JSON Patch over plain JSON documents (dicts, lists and scalars).
+
+Used for incremental draft edits: the designer sends only the operations that
+changed, instead of the whole field list; and by draft revisions, which store
+the diff between consecutive versions.
+"""
+import copy
+from typing import Any
+from shared.errors import PatchError
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """RFC 6901 JSON Pointer → reference tokens."""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise PatchError(pointer, "JSON Pointer must start with '/'.")
+    return [t.replace("~1", "/").replace("~0", "~") for t in pointer[1:].split("/")]
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _index(container: list, token: str, pointer: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise PatchError(pointer, f"'{token}' is not an array index.")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise PatchError(pointer, f"Index {index} is out of range.")
+    return index
+
+
+def _resolve(doc: Any, tokens: list[str], pointer: str) -> Any:
+    node = doc
+    for token in tokens:
+        if isinstance(node, dict):
+            if token not in node:
+                raise PatchError(pointer, f"Member '{token}' does not exist.")
+            node = node[token]
+        elif isinstance(node, list):
+            node = node[_index(node, token, pointer)]
+        else:
+            raise PatchError(pointer, "Path does not exist.")
+    return node
+
+
+def _add(doc: Any, tokens: list[str], value: Any, pointer: str) -> Any:
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1], pointer)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        parent[token] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, token, pointer, allow_end=True), value)
+    else:
+        raise PatchError(pointer, "Parent is not a container.")
+    return doc
+
+
+def _remove(doc: Any, tokens: list[str], pointer: str) -> Any:
+    if not tokens:
+        raise PatchError(pointer, "Cannot remove the whole document.")
+    parent = _resolve(doc, tokens[:-1], pointer)
+    token = tokens[-1]
+    if isinstance(parent, dict):
+        if token not in parent:
+            raise PatchError(pointer, f"Member '{token}' does not exist.")
+        return parent.pop(token)
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, token, pointer))
+    raise PatchError(pointer, "Parent is not a container.")
+
+
+def apply_patch(doc: Any, operations: list[dict]) -> Any:
+    """Applies operations in order and returns the patched document. The input
+    is not modified; if any operation fails, PatchError is raised and nothing
+    is applied."""
+    doc = copy.deepcopy(doc)
+    for operation in operations:
+        op = operation.get("op")
+        path = operation.get("path", "")
+        tokens = parse_pointer(path)
+
+        if op == "add":
+            doc = _add(doc, tokens, copy.deepcopy(operation.get("value")), path)
+        elif op == "remove":
+            _remove(doc, tokens, path)
+        elif op == "replace":
+            _resolve(doc, tokens, path)
+            if tokens:
+                _remove(doc, tokens, path)
+            doc = _add(doc, tokens, copy.deepcopy(operation.get("value")), path)
+        elif op in ("move", "copy"):
+            source = operation.get("from", "")
+            source_tokens = parse_pointer(source)
+            if op == "move" and tokens[:len(source_tokens)] == source_tokens and tokens != source_tokens:
+                raise PatchError(path, "Cannot move a value into one of its children.")
+            value = _resolve(doc, source_tokens, source)
+            if op == "move":
+                _remove(doc, source_tokens, source)
+            else:
+                value = copy.deepcopy(value)
+            doc = _add(doc, tokens, value, path)
+        elif op == "test":
+            if _resolve(doc, tokens, path) != operation.get("value"):
+                raise PatchError(path, "Test failed: value does not match.")
+        else:
+            raise PatchError(path, f"Unknown operation '{op}'.")
+    return doc
+
+
+def diff(source: Any, target: Any, path: str = "") -> list[dict]:
+    """Operations turning source into target, sized by what changed rather than
+    by the documents: objects are compared member by member, and lists keep
+    their common prefix and suffix, so inserting or removing one field of a
+    long list is a single operation."""
+    if source == target:
+        return []
+    if isinstance(source, dict) and isinstance(target, dict):
+        operations = []
+        for key, value in source.items():
+            member = f"{path}/{_escape(key)}"
+            if key not in target:
+                operations.append({"op": "remove", "path": member})
+            else:
+                operations.extend(diff(value, target[key], member))
+        for key, value in target.items():
+            if key not in source:
+                operations.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": value})
+        return operations
+    if isinstance(source, list) and isinstance(target, list):
+        shortest = min(len(source), len(target))
+        prefix = 0
+        while prefix < shortest and source[prefix] == target[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < shortest - prefix and source[-1 - suffix] == target[-1 - suffix]:
+            suffix += 1
+        old = source[prefix:len(source) - suffix]
+        new = target[prefix:len(target) - suffix]
+        common = min(len(old), len(new))
+
+        operations = []
+        for i in range(common):
+            operations.extend(diff(old[i], new[i], f"{path}/{prefix + i}"))
+        for i in reversed(range(common, len(old))):
+            operations.append({"op": "remove", "path": f"{path}/{prefix + i}"})
+        for i in range(common, len(new)):
+            operations.append({"op": "add", "path": f"{path}/{prefix + i}", "value": new[i]})
+        return operations
+    return [{"op": "replace", "path": path, "value": target}]
@@ -1,12 +1,16 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, Text, DateTime
+from sqlalchemy import ForeignKey, String, Integer, Text, Index
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.dialects.postgresql import JSONB
-from shared.database import Base
+from shared.database import Base, UTCDateTime
 
 
 class FormDraftModel(Base):
     __tablename__ = "form_drafts"
+    __table_args__ = (
+        Index("ix_form_drafts_created_at_id", "created_at", "id"),
+        Index("ix_form_drafts_status_created_at_id", "status", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True)
     name: Mapped[str] = mapped_column(String, nullable=False)
@@ -18,5 +22,36 @@ class FormDraftModel(Base):
     layout: Mapped[dict] = mapped_column(JSONB, nullable=False)
     actions: Mapped[dict] = mapped_column(JSONB, nullable=False)
     css_overrides: Mapped[str | None] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(UTCDateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class FormDraftRevisionModel(Base):
+    """One row per draft version: a full snapshot of the draft document, or the
+    JSON Patch from the previous version (see contexts/form_design/revisions.py)."""
+    __tablename__ = "form_draft_revisions"
+
+    draft_id: Mapped[str] = mapped_column(
+        String, ForeignKey("form_drafts.id", ondelete="CASCADE"), primary_key=True,
+    )
+    version: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # none_as_null: the row kind is told apart by which of the two IS NULL.
+    snapshot: Mapped[dict | None] = mapped_column(JSONB(none_as_null=True), nullable=True)
+    patch: Mapped[list | None] = mapped_column(JSONB(none_as_null=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default=datetime.utcnow)
+
+
+class GenerationJobModel(Base):
+    __tablename__ = "generation_jobs"
+    __table_args__ = (Index("ix_generation_jobs_status_created_at", "status", "created_at"),)
+
+    id: Mapped[str] = mapped_column(String, primary_key=True)
+    kind: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[str] = mapped_column(String, default="pending")
+    payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    result: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    errors: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default=datetime.utcnow)
+    started_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(UTCDateTime, nullable=True)
@@ -0,0 +1,111 @@
+"""Draft version history, stored as deltas.
+
+Every draft write records a row in form_draft_revisions for the new version.
+Most rows hold only the JSON Patch from the previous version, so history grows
+with the size of each edit rather than the size of the form. A full snapshot
+is stored when a draft is created and every DRAFT_SNAPSHOT_INTERVAL versions,
+so rebuilding any version replays fewer than that many patches.
+"""
+import os
+from datetime import datetime, timezone
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from contexts.form_design.json_patch import apply_patch, diff
+from contexts.form_design.models import FormDraftRevisionModel
+from contexts.form_design.schemas import DraftRevision, FormDraft
+
+DRAFT_SNAPSHOT_INTERVAL = int(os.getenv("DRAFT_SNAPSHOT_INTERVAL", "20"))
+
+
+def draft_document(draft: FormDraft) -> dict:
+    """The versioned part of a draft, in the form its columns store it."""
+    return dict(
+        name=draft.name,
+        description=draft.description,
+        status=draft.status,
+        fields=[f.model_dump() for f in draft.fields],
+        layout=draft.layout.model_dump(),
+        actions=[a.model_dump() for a in draft.actions],
+        css_overrides=draft.css_overrides,
+    )
+
+
+class RevisionStore:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def record_created(self, drafts: list[FormDraft]) -> None:
+        """Stages a base snapshot for new drafts. The caller commits."""
+        self.db.add_all([
+            FormDraftRevisionModel(
+                draft_id=draft.id,
+                version=draft.version,
+                snapshot=draft_document(draft),
+                created_at=datetime.fromisoformat(draft.created_at),
+            )
+            for draft in drafts
+        ])
+
+    def record_update(self, before: dict, updated: FormDraft) -> None:
+        """Stages the revision for updated.version, given the document of the
+        version it was written over. The caller commits."""
+        after = draft_document(updated)
+        snapshot = updated.version % DRAFT_SNAPSHOT_INTERVAL == 0
+        self.db.add(FormDraftRevisionModel(
+            draft_id=updated.id,
+            version=updated.version,
+            snapshot=after if snapshot else None,
+            patch=None if snapshot else diff(before, after),
+            created_at=datetime.now(timezone.utc),
+        ))
+
+    async def history(self, draft_id: str, limit: int, before: int | None = None) -> list[DraftRevision]:
+        """Newest first; `before` continues from the oldest version already seen."""
+        stmt = select(
+            FormDraftRevisionModel.version,
+            FormDraftRevisionModel.created_at,
+            FormDraftRevisionModel.snapshot.is_not(None).label("is_snapshot"),
+            func.coalesce(func.jsonb_array_length(FormDraftRevisionModel.patch), 0).label("changes"),
+        ).where(FormDraftRevisionModel.draft_id == draft_id)
+        if before is not None:
+            stmt = stmt.where(FormDraftRevisionModel.version < before)
+        stmt = stmt.order_by(FormDraftRevisionModel.version.desc()).limit(limit)
+        return [
+            DraftRevision(
+                version=r.version,
+                created_at=r.created_at.isoformat(),
+                snapshot=r.is_snapshot,
+                changes=r.changes,
+            )
+            for r in (await self.db.execute(stmt)).all()
+        ]
+
+    async def document_at(self, draft_id: str, version: int) -> tuple[dict, datetime] | None:
+        """Rebuilds the draft document at `version` from the nearest snapshot at
+        or before it, and returns it with the revision's timestamp."""
+        base = (
+            select(func.max(FormDraftRevisionModel.version))
+            .where(
+                FormDraftRevisionModel.draft_id == draft_id,
+                FormDraftRevisionModel.version <= version,
+                FormDraftRevisionModel.snapshot.is_not(None),
+            )
+            .scalar_subquery()
+        )
+        rows = (await self.db.execute(
+            select(FormDraftRevisionModel.version, FormDraftRevisionModel.snapshot,
+                   FormDraftRevisionModel.patch, FormDraftRevisionModel.created_at)
+            .where(
+                FormDraftRevisionModel.draft_id == draft_id,
+                FormDraftRevisionModel.version >= base,
+                FormDraftRevisionModel.version <= version,
+            )
+            .order_by(FormDraftRevisionModel.version)
+        )).all()
+        if not rows or [r.version for r in rows] != list(range(rows[0].version, version + 1)):
+            return None
+
+        document = rows[0].snapshot
+        for row in rows[1:]:
+            document = apply_patch(document, row.patch)
+        return document, rows[-1].created_at
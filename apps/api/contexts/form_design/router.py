@@ -1,58 +1,253 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from shared.database import get_db
-from shared.errors import DraftValidationError, GenerationOutputError
+import json
+import logging
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from shared.database import get_async_db, get_read_db
+from contexts.app_services import AppServices, get_app_services
+from shared.errors import (
+    DraftValidationError, FieldValidationError, GenerationOutputError, InvalidCursorError, PatchError,
+    VersionConflictError,
+)
+from shared.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 from contexts.form_design.schemas import (
-    FormDraft, GenerationRequest, DraftUpdateRequest, DraftSummary,
+    FormDraft, FormFieldDraft, GenerationRequest, DraftUpdateRequest, DraftSummary,
+    BatchGenerationRequest, BatchGenerationResult, GenerationJob, DraftImportResult, JsonPatchOperation,
+    DraftRevision, DraftRuleStats, GenerationCacheStats,
 )
+from contexts.form_design.importer import DraftImporter, split_lines
 from contexts.form_design.service import FormDesignService
+from contexts.form_design.jobs import JobQueue
+from contexts.generation.service import UPSTREAM_ERRORS
 
 router = APIRouter(prefix="/design", tags=["Form Design"])
+logger = logging.getLogger(__name__)
+
+
+def get_service(
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_read_db),
+    services: AppServices = Depends(get_app_services),
+) -> FormDesignService:
+    return services.design_service(db, read_db=read_db)
+
+
+def draft_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def expected_version(if_match: str | None = Header(default=None)) -> int | None:
+    """Parses If-Match as a draft ETag (the quoted version). Absent or "*"
+    means the write is unconditional."""
+    if if_match is None or if_match.strip() == "*":
+        return None
+    tag = if_match.strip().removeprefix("W/").strip('"')
+    if not tag.isdigit():
+        raise HTTPException(status_code=400, detail="If-Match must be a draft ETag")
+    return int(tag)
 
 
-def get_service(db: Session = Depends(get_db)) -> FormDesignService:
-    return FormDesignService(db)
+def _conflict(e: VersionConflictError) -> HTTPException:
+    headers = {"ETag": draft_etag(e.current_version)} if e.current_version is not None else None
+    return HTTPException(status_code=409, detail=str(e), headers=headers)
 
 
-@router.post("/generate", response_model=FormDraft)
-def generate_form(request: GenerationRequest, service: FormDesignService = Depends(get_service)):
+def get_importer(
+    db: AsyncSession = Depends(get_async_db),
+    services: AppServices = Depends(get_app_services),
+) -> DraftImporter:
+    return services.draft_importer(db)
+
+
+def get_job_queue(db: AsyncSession = Depends(get_async_db)) -> JobQueue:
+    return JobQueue(db)
+
+
+@router.post("/generate", response_model=FormDraft, responses={202: {"model": GenerationJob}})
+async def generate_form(
+    request: GenerationRequest,
+    background: bool = False,
+    service: FormDesignService = Depends(get_service),
+    queue: JobQueue = Depends(get_job_queue),
+):
+    """With ?background=true the generation is queued and a job is returned
+    immediately; poll GET /design/jobs/{id} for the resulting draft."""
+    if background:
+        job = await queue.enqueue_generate(request)
+        return JSONResponse(status_code=202, content=job.model_dump(mode="json"))
     try:
-        return service.generate(request)
+        return await service.generate(request)
     except GenerationOutputError as e:
         raise HTTPException(status_code=422, detail=[err.model_dump() for err in e.errors])
     except DraftValidationError as e:
         raise HTTPException(status_code=422, detail=[err.model_dump() for err in e.errors])
 
 
+@router.post("/generate/stream")
+async def generate_form_stream(request: GenerationRequest, service: FormDesignService = Depends(get_service)):
+    """NDJSON stream: one {"event": "field"} line per field as it is generated,
+    then {"event": "draft"} with the persisted draft, or {"event": "error"}."""
+    async def events():
+        try:
+            async for item in service.generate_stream(request):
+                event = "field" if isinstance(item, FormFieldDraft) else "draft"
+                yield json.dumps({"event": event, "data": item.model_dump(mode="json")}) + "\n"
+        except (GenerationOutputError, DraftValidationError) as e:
+            yield json.dumps({"event": "error", "data": [err.model_dump() for err in e.errors]}) + "\n"
+        except UPSTREAM_ERRORS as exc:
+            # The 200 is already sent; without a final event the client could
+            # not tell a failed provider from a dropped connection.
+            logger.warning("Streamed generation failed upstream", exc_info=True)
+            error = FieldValidationError(field="llm", message=f"LLM request failed: {exc}")
+            yield json.dumps({"event": "error", "data": [error.model_dump()]}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@router.post("/generate/batch", response_model=BatchGenerationResult)
+async def generate_batch(request: BatchGenerationRequest, service: FormDesignService = Depends(get_service)):
+    return await service.generate_batch(request.requests)
+
+
+@router.post("/generate/batch/jobs", response_model=GenerationJob, status_code=202)
+async def submit_batch_job(request: BatchGenerationRequest, queue: JobQueue = Depends(get_job_queue)):
+    return await queue.enqueue_batch(request)
+
+
+@router.get("/jobs/{job_id}", response_model=GenerationJob)
+async def get_job(job_id: str, queue: JobQueue = Depends(get_job_queue)):
+    job = await queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/import", response_model=DraftImportResult)
+async def import_drafts(request: Request, importer: DraftImporter = Depends(get_importer)):
+    """Bulk-loads an NDJSON body of FormDrafts, publishing each one. Lines
+    that fail to parse or validate, or whose id exists, are reported by line
+    number; the rest are imported."""
+    return await importer.import_lines(split_lines(request.stream()))
+
+
+@router.get("/rules", response_model=list[DraftRuleStats])
+async def list_rules(services: AppServices = Depends(get_app_services)):
+    return services.validator.rules.stats()
+
+
+@router.get("/generation-cache", response_model=GenerationCacheStats)
+async def generation_cache_stats(services: AppServices = Depends(get_app_services)):
+    """Hits and misses of this worker's generation cache since startup."""
+    cache = services.generation_service.cache
+    if cache is None:
+        return GenerationCacheStats(backend="off", hits=0, misses=0, hit_ratio=None)
+    lookups = cache.stats.hits + cache.stats.misses
+    return GenerationCacheStats(
+        backend=cache.backend,
+        hits=cache.stats.hits,
+        misses=cache.stats.misses,
+        hit_ratio=cache.stats.hits / lookups if lookups else None,
+    )
+
+
 @router.get("/drafts", response_model=list[DraftSummary])
-def list_drafts(service: FormDesignService = Depends(get_service)):
-    return service.list_drafts()
+async def list_drafts(
+    response: Response,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    name: str | None = None,
+    status: str | None = None,
+    service: FormDesignService = Depends(get_service),
+):
+    """Newest first. When more drafts follow, the X-Next-Cursor header holds
+    the cursor to pass back for the next page."""
+    try:
+        drafts, next_cursor = await service.list_drafts(limit, cursor, name, status)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return drafts
 
 
 @router.get("/drafts/{draft_id}", response_model=FormDraft)
-def get_draft(draft_id: str, service: FormDesignService = Depends(get_service)):
-    draft = service.get_draft(draft_id)
-    if not draft:
+async def get_draft(draft_id: str, service: FormDesignService = Depends(get_service)):
+    found = await service.get_draft_json(draft_id)
+    if not found:
         raise HTTPException(status_code=404, detail="Draft not found")
-    return draft
+    version, body = found
+    return Response(content=body, media_type="application/json", headers={"ETag": draft_etag(version)})
 
 
 @router.patch("/drafts/{draft_id}", response_model=FormDraft)
-def update_draft(
+async def update_draft(
     draft_id: str,
     update: DraftUpdateRequest,
+    response: Response,
+    version: int | None = Depends(expected_version),
     service: FormDesignService = Depends(get_service),
 ):
+    """Send the draft's ETag as If-Match to fail with 409 instead of
+    overwriting a newer version."""
     try:
-        draft = service.update_draft(draft_id, update)
+        draft = await service.update_draft(draft_id, update, version)
     except DraftValidationError as e:
         raise HTTPException(status_code=422, detail=[err.model_dump() for err in e.errors])
+    except VersionConflictError as e:
+        raise _conflict(e)
+    if not draft:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    response.headers["ETag"] = draft_etag(draft.version)
+    return draft
+
+
+@router.patch("/drafts/{draft_id}/json-patch", response_model=FormDraft)
+async def patch_draft(
+    draft_id: str,
+    operations: list[JsonPatchOperation],
+    response: Response,
+    version: int | None = Depends(expected_version),
+    service: FormDesignService = Depends(get_service),
+):
+    """RFC 6902 JSON Patch, e.g. [{"op": "replace", "path": "/fields/3/label",
+    "value": "Email"}], so autosaves send only what changed."""
+    try:
+        draft = await service.patch_draft(
+            draft_id, [op.model_dump(by_alias=True, exclude_unset=True) for op in operations], version,
+        )
+    except (PatchError, DraftValidationError) as e:
+        raise HTTPException(status_code=422, detail=[err.model_dump() for err in e.errors])
+    except VersionConflictError as e:
+        raise _conflict(e)
     if not draft:
         raise HTTPException(status_code=404, detail="Draft not found")
+    response.headers["ETag"] = draft_etag(draft.version)
+    return draft
+
+
+@router.get("/drafts/{draft_id}/revisions", response_model=list[DraftRevision])
+async def list_revisions(
+    draft_id: str,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    before: int | None = None,
+    service: FormDesignService = Depends(get_service),
+):
+    """Newest first; pass the oldest version received as `before` for the next page."""
+    revisions = await service.list_revisions(draft_id, limit, before)
+    if revisions is None:
+        raise HTTPException(status_code=404, detail="Draft not found")
+    return revisions
+
+
+@router.get("/drafts/{draft_id}/revisions/{version}", response_model=FormDraft)
+async def get_revision(draft_id: str, version: int, service: FormDesignService = Depends(get_service)):
+    draft = await service.get_revision(draft_id, version)
+    if not draft:
+        raise HTTPException(status_code=404, detail="Revision not found")
     return draft
 
 
 @router.delete("/drafts/{draft_id}", status_code=204)
-def delete_draft(draft_id: str, service: FormDesignService = Depends(get_service)):
-    if not service.delete_draft(draft_id):
+async def delete_draft(draft_id: str, service: FormDesignService = Depends(get_service)):
+    if not await service.delete_draft(draft_id):
         raise HTTPException(status_code=404, detail="Draft not found")
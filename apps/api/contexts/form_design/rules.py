@@ -0,0 +1,191 @@
+"""Deployment-specific draft rules, declared as data.
+
+Rules are a JSON list such as
+
+    [{"id": "max-fields", "kind": "max_fields", "max": 200},
+     {"id": "no-passwords", "kind": "banned_types", "types": ["password"]},
+     {"id": "snake-keys", "kind": "key_pattern", "pattern": "^[a-z][a-z0-9_]*$"},
+     {"id": "conditionals", "kind": "conditional_reference"}]
+
+read from the file named by DRAFT_RULES_FILE. They are compiled once into a
+RuleSet that checks every rule in a single pass over draft.fields: field-level
+checks run per field, and draft-level checks run after the pass against what
+it collected (field count, keys). An optional "message" overrides the default
+error message of a rule.
+"""
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable
+from contexts.form_design.schemas import DraftRuleStats, FormDraft, FormFieldDraft
+from shared.errors import FieldValidationError
+
+DRAFT_RULES_FILE = os.getenv("DRAFT_RULES_FILE")
+
+FieldCheck = Callable[[FormFieldDraft], "FieldValidationError | None"]
+DraftCheck = Callable[["_Pass"], "list[FieldValidationError]"]
+
+
+@dataclass
+class _Counters:
+    evaluations: int = 0
+    violations: int = 0
+    seconds: float = 0.0
+
+
+@dataclass
+class _Pass:
+    """What a single traversal of draft.fields collects for draft-level checks."""
+    draft: FormDraft
+    keys: set[str]
+    conditionals: list[FormFieldDraft]
+
+
+@dataclass
+class _Rule:
+    id: str
+    field_check: FieldCheck | None = None
+    draft_check: DraftCheck | None = None
+
+
+def _max_fields(spec: dict) -> _Rule:
+    limit = int(spec["max"])
+    message = spec.get("message", f"Draft must not have more than {limit} fields.")
+
+    def check(p: _Pass) -> list[FieldValidationError]:
+        if len(p.draft.fields) <= limit:
+            return []
+        return [FieldValidationError(field="fields", message=message)]
+
+    return _Rule(spec["id"], draft_check=check)
+
+
+def _banned_types(spec: dict) -> _Rule:
+    banned = frozenset(spec["types"])
+    message = spec.get("message", "Field '{key}' uses banned type '{type}'.")
+
+    def check(field: FormFieldDraft) -> FieldValidationError | None:
+        if field.type not in banned:
+            return None
+        return FieldValidationError(
+            field=f"fields.{field.key}.type",
+            message=message.format(key=field.key, type=field.type),
+        )
+
+    return _Rule(spec["id"], field_check=check)
+
+
+def _key_pattern(spec: dict) -> _Rule:
+    pattern = re.compile(spec["pattern"])
+    message = spec.get("message", "Field key '{key}' does not match the required pattern.")
+
+    def check(field: FormFieldDraft) -> FieldValidationError | None:
+        if pattern.fullmatch(field.key):
+            return None
+        return FieldValidationError(field=f"fields.{field.key}.key", message=message.format(key=field.key))
+
+    return _Rule(spec["id"], field_check=check)
+
+
+def _conditional_reference(spec: dict) -> _Rule:
+    message = spec.get("message", "Field '{key}' is conditional on unknown field '{target}'.")
+
+    def check(p: _Pass) -> list[FieldValidationError]:
+        return [
+            FieldValidationError(
+                field=f"fields.{field.key}.conditional.field",
+                message=message.format(key=field.key, target=field.conditional.field),
+            )
+            for field in p.conditionals
+            if field.conditional.field not in p.keys
+        ]
+
+    return _Rule(spec["id"], draft_check=check)
+
+
+RULE_KINDS: dict[str, Callable[[dict], _Rule]] = {
+    "max_fields": _max_fields,
+    "banned_types": _banned_types,
+    "key_pattern": _key_pattern,
+    "conditional_reference": _conditional_reference,
+}
+
+
+class RuleSet:
+    def __init__(self, specs: list[dict]):
+        """Compiles rule specs; raises ValueError on an unknown kind or a
+        repeated id, so a bad rules file fails at startup."""
+        rules = []
+        for spec in specs:
+            factory = RULE_KINDS.get(spec.get("kind"))
+            if factory is None:
+                raise ValueError(f"Unknown draft rule kind {spec.get('kind')!r} in rule {spec.get('id')!r}.")
+            rules.append(factory(spec))
+        ids = [r.id for r in rules]
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"Draft rule ids must be unique: {ids}")
+
+        self._field_rules = [(i, r.field_check) for i, r in enumerate(rules) if r.field_check]
+        self._draft_rules = [(i, r.draft_check) for i, r in enumerate(rules) if r.draft_check]
+        self._ids = ids
+        self._stats = [_Counters() for _ in rules]
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def evaluate(self, draft: FormDraft) -> list[FieldValidationError]:
+        """Errors of every rule, field-level ones in field order first."""
+        if not self._ids:
+            return []
+        errors: list[FieldValidationError] = []
+        elapsed = [0] * len(self._ids)
+        violations = [0] * len(self._ids)
+        field_rules = self._field_rules
+        keys = set()
+        conditionals = []
+
+        clock = time.perf_counter_ns
+        for field in draft.fields:
+            keys.add(field.key)
+            if field.conditional is not None:
+                conditionals.append(field)
+            started = clock()
+            for i, check in field_rules:
+                error = check(field)
+                now = clock()
+                elapsed[i] += now - started
+                started = now
+                if error is not None:
+                    violations[i] += 1
+                    errors.append(error)
+
+        collected = _Pass(draft=draft, keys=keys, conditionals=conditionals)
+        for i, check in self._draft_rules:
+            started = clock()
+            found = check(collected)
+            elapsed[i] += clock() - started
+            violations[i] += len(found)
+            errors.extend(found)
+
+        for stats, ns, n in zip(self._stats, elapsed, violations):
+            stats.evaluations += 1
+            stats.violations += n
+            stats.seconds += ns / 1e9
+        return errors
+
+    def stats(self) -> list[DraftRuleStats]:
+        """Per-rule counters accumulated since startup, in declaration order."""
+        return [
+            DraftRuleStats(id=rule_id, evaluations=s.evaluations, violations=s.violations, seconds=s.seconds)
+            for rule_id, s in zip(self._ids, self._stats)
+        ]
+
+
+def build_rule_set() -> RuleSet:
+    """Rules from DRAFT_RULES_FILE; none when unset."""
+    if not DRAFT_RULES_FILE:
+        return RuleSet([])
+    with open(DRAFT_RULES_FILE, encoding="utf-8") as f:
+        return RuleSet(json.load(f))
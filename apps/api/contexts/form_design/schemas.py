@@ -1,7 +1,8 @@
 from __future__ import annotations
 from typing import Literal, Optional, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from shared.renderable_form import FieldType, ValidatorConfig, FieldOption
+from shared.errors import FieldValidationError
 
 
 class FormLayoutDraft(BaseModel):
@@ -59,6 +60,48 @@ class GenerationRequest(BaseModel):
     prompt: str
 
 
+class BatchGenerationRequest(BaseModel):
+    requests: list[GenerationRequest]
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    prompt: str
+    draft_id: Optional[str] = None
+    errors: list[FieldValidationError] = []
+
+
+class BatchGenerationResult(BaseModel):
+    succeeded: int
+    failed: int
+    items: list[BatchItemResult]
+
+
+class ImportLineError(BaseModel):
+    line: int
+    draft_id: Optional[str] = None
+    errors: list[FieldValidationError]
+
+
+class DraftImportResult(BaseModel):
+    imported: int = 0
+    failed: int = 0
+    errors: list[ImportLineError] = []
+
+
+class GenerationJob(BaseModel):
+    id: str
+    kind: Literal["generate", "batch"]
+    status: Literal["pending", "running", "completed", "failed"]
+    attempts: int
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    draft: Optional[FormDraft] = None
+    batch: Optional[BatchGenerationResult] = None
+    errors: list[FieldValidationError] = []
+
+
 class DraftUpdateRequest(BaseModel):
     name: Optional[str] = None
     description: Optional[str] = None
@@ -68,6 +111,36 @@ class DraftUpdateRequest(BaseModel):
     css_overrides: Optional[str] = None
 
 
+class DraftRevision(BaseModel):
+    version: int
+    created_at: str
+    snapshot: bool
+    changes: int
+
+
+class DraftRuleStats(BaseModel):
+    id: str
+    evaluations: int
+    violations: int
+    seconds: float
+
+
+class GenerationCacheStats(BaseModel):
+    backend: str
+    hits: int
+    misses: int
+    hit_ratio: float | None
+
+
+class JsonPatchOperation(BaseModel):
+    """One RFC 6902 operation. Paths address the draft's name, description,
+    fields, layout, actions and css_overrides, e.g. /fields/3/label."""
+    op: Literal["add", "remove", "replace", "move", "copy", "test"]
+    path: str
+    value: Optional[Any] = None
+    from_: Optional[str] = Field(default=None, alias="from")
+
+
 class DraftSummary(BaseModel):
     id: str
     name: str
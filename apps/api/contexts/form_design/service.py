@@ -1,57 +1,197 @@
 from __future__ import annotations
+import asyncio
+import os
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
+from typing import Any, AsyncIterator
+from pydantic import ValidationError
+from sqlalchemy import ARRAY, Text, case, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
 from contexts.form_design.schemas import (
-    FormDraft, FormFieldDraft, FormLayoutDraft, FormActionDraft,
+    FormDraft, FormFieldDraft,
     GenerationRequest, DraftUpdateRequest, DraftSummary,
+    BatchGenerationResult, BatchItemResult, DraftRevision,
 )
+from contexts.form_design.json_patch import apply_patch, parse_pointer
 from contexts.form_design.models import FormDraftModel
+from contexts.form_design.revisions import RevisionStore, draft_document
 from contexts.form_design.validator import FormDraftValidator
+from contexts.generation.schemas import LLMField
 from contexts.generation.service import GenerationService
 from contexts.generation.translator import LLMTranslator
 from contexts.form_catalog.service import FormCatalogService
+from contexts.form_catalog.translator import CatalogTranslator
+from shared.errors import (
+    DraftValidationError, FieldValidationError, GenerationOutputError, PatchError,
+    VersionConflictError, field_errors,
+)
+from shared.pagination import DEFAULT_PAGE_SIZE, name_pattern, page, paginate
+
+# Upper bound on LLM calls a single batch keeps in flight at once.
+BATCH_PARALLELISM = int(os.getenv("LLM_BATCH_PARALLELISM", "16"))
+
+# The members of a draft a JSON Patch may touch, and which of them are JSONB.
+PATCHABLE_MEMBERS = ("name", "description", "fields", "layout", "actions", "css_overrides")
+JSONB_MEMBERS = ("fields", "layout", "actions")
 
 
 class FormDesignService:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: AsyncSession,
+        generation_service: GenerationService | None = None,
+        translator: LLMTranslator | None = None,
+        validator: FormDraftValidator | None = None,
+        catalog_translator: CatalogTranslator | None = None,
+        read_db: AsyncSession | None = None,
+    ):
         self.db = db
-        self.validator = FormDraftValidator()
-        self.generation_service = GenerationService()
-        self.translator = LLMTranslator()
-        self.catalog_service = FormCatalogService(db)
+        # Draft listings may lag the primary by replication delay; writes never use this.
+        self.read_db = read_db or db
+        self.validator = validator or FormDraftValidator()
+        self.generation_service = generation_service or GenerationService()
+        self.translator = translator or LLMTranslator()
+        self.catalog_service = FormCatalogService(db, translator=catalog_translator)
+        self.revisions = RevisionStore(db)
 
-    def generate(self, request: GenerationRequest) -> FormDraft:
-        llm_output = self.generation_service.generate(request.prompt)
+    async def generate(self, request: GenerationRequest) -> FormDraft:
+        llm_output = await self.generation_service.generate(request.prompt)
         draft = self.translator.translate(llm_output, prompt=request.prompt)
         self.validator.validate(draft)
-        self._save(draft)
-        self.catalog_service.publish(draft)
+        await self._save(draft)
         return draft
 
-    def get_draft(self, draft_id: str) -> FormDraft | None:
-        model = self.db.get(FormDraftModel, draft_id)
-        return self._to_schema(model) if model else None
+    async def generate_batch(self, requests: list[GenerationRequest]) -> BatchGenerationResult:
+        """Fans prompts out to the LLM with bounded parallelism, then saves and
+        publishes every valid draft in one transaction. Failures are reported
+        per item and never abort the rest of the batch."""
+        slots = asyncio.Semaphore(BATCH_PARALLELISM)
+
+        async def run(request: GenerationRequest):
+            async with slots:
+                return await self.generation_service.generate(request.prompt)
+
+        outputs = await asyncio.gather(*(run(r) for r in requests), return_exceptions=True)
+
+        items: list[BatchItemResult] = []
+        drafts: list[FormDraft] = []
+        for index, (request, output) in enumerate(zip(requests, outputs)):
+            item = BatchItemResult(index=index, prompt=request.prompt)
+            items.append(item)
+            if isinstance(output, (GenerationOutputError, DraftValidationError)):
+                item.errors = output.errors
+                continue
+            if isinstance(output, Exception):
+                item.errors = [FieldValidationError(field="llm_output", message=str(output))]
+                continue
+            draft = self.translator.translate(output, prompt=request.prompt)
+            try:
+                self.validator.validate(draft)
+            except DraftValidationError as e:
+                item.errors = e.errors
+                continue
+            item.draft_id = draft.id
+            drafts.append(draft)
 
-    def list_drafts(self) -> list[DraftSummary]:
-        models = self.db.query(FormDraftModel).order_by(FormDraftModel.created_at.desc()).all()
+        if drafts:
+            self.db.add_all([self._to_model(d) for d in drafts])
+            self.revisions.record_created(drafts)
+            self.catalog_service.publish_new(drafts)
+            await self.db.commit()
+
+        return BatchGenerationResult(
+            succeeded=len(drafts),
+            failed=len(items) - len(drafts),
+            items=items,
+        )
+
+    async def generate_stream(self, request: GenerationRequest) -> AsyncIterator[FormFieldDraft | FormDraft]:
+        """Streams translated fields as the LLM produces them, then the
+        validated, saved and published FormDraft."""
+        index = 0
+        async for item in self.generation_service.generate_stream(request.prompt):
+            if isinstance(item, LLMField):
+                yield self.translator._translate_field(item, index)
+                index += 1
+                continue
+
+            draft = self.translator.translate(item, prompt=request.prompt)
+            self.validator.validate(draft)
+            await self._save(draft)
+            yield draft
+
+    async def get_draft_json(self, draft_id: str) -> tuple[int, bytes] | None:
+        """The draft's version and its FormDraft JSON, rendered by Postgres.
+        Stored drafts were validated when written, so the read path skips the
+        ORM, pydantic and response validation altogether."""
+        document = func.json_build_object(
+            "id", FormDraftModel.id,
+            "name", FormDraftModel.name,
+            "description", FormDraftModel.description,
+            "prompt", FormDraftModel.prompt,
+            "version", FormDraftModel.version,
+            "status", FormDraftModel.status,
+            "created_at", _isoformat(FormDraftModel.created_at),
+            "updated_at", _isoformat(FormDraftModel.updated_at),
+            "fields", FormDraftModel.fields,
+            "layout", FormDraftModel.layout,
+            "actions", FormDraftModel.actions,
+            "css_overrides", FormDraftModel.css_overrides,
+        )
+        row = (await self.db.execute(
+            select(FormDraftModel.version, cast(document, Text)).where(FormDraftModel.id == draft_id)
+        )).first()
+        if row is None:
+            return None
+        return row[0], row[1].encode()
+
+    async def list_drafts(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: str | None = None,
+        name: str | None = None,
+        status: str | None = None,
+    ) -> tuple[list[DraftSummary], str | None]:
+        """Newest-first page of draft summaries and the cursor of the next page.
+        Only summary columns are selected; the JSONB form body is never read."""
+        stmt = select(
+            FormDraftModel.id,
+            FormDraftModel.name,
+            FormDraftModel.description,
+            FormDraftModel.status,
+            FormDraftModel.version,
+            FormDraftModel.created_at,
+            FormDraftModel.updated_at,
+        )
+        if name:
+            stmt = stmt.where(FormDraftModel.name.ilike(name_pattern(name), escape="\\"))
+        if status:
+            stmt = stmt.where(FormDraftModel.status == status)
+        stmt = paginate(stmt, FormDraftModel.created_at, FormDraftModel.id, limit, cursor)
+        rows, next_cursor = page((await self.read_db.execute(stmt)).all(), limit, "created_at")
         return [
             DraftSummary(
-                id=m.id,
-                name=m.name,
-                description=m.description,
-                status=m.status,
-                version=m.version,
-                created_at=m.created_at.isoformat(),
-                updated_at=m.updated_at.isoformat(),
+                id=r.id,
+                name=r.name,
+                description=r.description,
+                status=r.status,
+                version=r.version,
+                created_at=r.created_at.isoformat(),
+                updated_at=r.updated_at.isoformat(),
             )
-            for m in models
-        ]
+            for r in rows
+        ], next_cursor
 
-    def update_draft(self, draft_id: str, update: DraftUpdateRequest) -> FormDraft | None:
-        model = self.db.get(FormDraftModel, draft_id)
+    async def update_draft(
+        self, draft_id: str, update: DraftUpdateRequest, expected_version: int | None = None,
+    ) -> FormDraft | None:
+        """Raises VersionConflictError if the draft is not at expected_version,
+        or if another write lands between reading and writing it."""
+        model = await self.db.get(FormDraftModel, draft_id)
         if not model:
             return None
+        _check_version(draft_id, model.version, expected_version)
 
         current = self._to_schema(model)
         updated = current.model_copy(update={
@@ -65,31 +205,153 @@ class FormDesignService:
 
         self.validator.validate(updated)
 
-        model.name = updated.name
-        model.description = updated.description
-        model.version = updated.version
-        model.status = updated.status
-        model.fields = [f.model_dump() for f in updated.fields]
-        model.layout = updated.layout.model_dump()
-        model.actions = [a.model_dump() for a in updated.actions]
-        model.css_overrides = updated.css_overrides
-        model.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(model)
-
-        self.catalog_service.publish(updated)
+        await self._write_draft(draft_id, current.version, dict(
+            name=updated.name,
+            description=updated.description,
+            version=updated.version,
+            status=updated.status,
+            fields=[f.model_dump() for f in updated.fields],
+            layout=updated.layout.model_dump(),
+            actions=[a.model_dump() for a in updated.actions],
+            css_overrides=updated.css_overrides,
+            updated_at=datetime.fromisoformat(updated.updated_at),
+        ))
+        self.revisions.record_update(draft_document(current), updated)
+        await self._publish_and_commit(updated, autosave=True)
+        return updated
+
+    async def patch_draft(
+        self, draft_id: str, operations: list[dict], expected_version: int | None = None,
+    ) -> FormDraft | None:
+        """Applies an RFC 6902 JSON Patch to a draft. Edits inside fields,
+        layout and actions are sent to Postgres as jsonb_set / jsonb_insert /
+        #- expressions on the stored JSONB rather than rewriting whole columns;
+        the write is conditional on the version read here, so the server-side
+        result matches the one validated. Raises PatchError,
+        DraftValidationError or VersionConflictError."""
+        columns = [getattr(FormDraftModel, name) for name in PATCHABLE_MEMBERS]
+        row = (await self.db.execute(
+            select(FormDraftModel.id, FormDraftModel.prompt, FormDraftModel.version,
+                   FormDraftModel.status, FormDraftModel.created_at, *columns)
+            .where(FormDraftModel.id == draft_id)
+        )).one_or_none()
+        if row is None:
+            return None
+        _check_version(draft_id, row.version, expected_version)
+
+        doc = doc_before = {name: getattr(row, name) for name in PATCHABLE_MEMBERS}
+        expressions: dict[str, Any] = {name: getattr(FormDraftModel, name) for name in JSONB_MEMBERS}
+        for operation in operations:
+            before = doc
+            doc = apply_patch(doc, [operation])
+            if not isinstance(doc, dict) or doc.keys() != before.keys():
+                raise PatchError(operation["path"], "Only existing draft members can be patched.")
+            _push_jsonb_step(expressions, operation, before)
+
+        now = datetime.now(timezone.utc)
+        try:
+            updated = FormDraft(
+                id=row.id,
+                prompt=row.prompt,
+                version=row.version + 1,
+                status="saved",
+                created_at=row.created_at.isoformat(),
+                updated_at=now.isoformat(),
+                **doc,
+            )
+        except ValidationError as e:
+            raise DraftValidationError(field_errors(e))
+        self.validator.validate(updated)
+
+        values = dict(
+            name=updated.name,
+            description=updated.description,
+            css_overrides=updated.css_overrides,
+            version=updated.version,
+            status=updated.status,
+            updated_at=now,
+        )
+        canonical = {
+            "fields": [f.model_dump() for f in updated.fields],
+            "layout": updated.layout.model_dump(),
+            "actions": [a.model_dump() for a in updated.actions],
+        }
+        for name in JSONB_MEMBERS:
+            if doc[name] == getattr(row, name):
+                continue
+            # Server-side edits are only safe when the patched value is already
+            # in stored form (e.g. a patch adding a field may omit defaults).
+            expression = expressions[name]
+            values[name] = expression if expression is not None and doc[name] == canonical[name] else canonical[name]
+
+        await self._write_draft(draft_id, row.version, values)
+        self.revisions.record_update({**doc_before, "status": row.status}, updated)
+        await self._publish_and_commit(updated, autosave=True)
         return updated
 
-    def delete_draft(self, draft_id: str) -> bool:
-        model = self.db.get(FormDraftModel, draft_id)
+    async def list_revisions(
+        self, draft_id: str, limit: int, before: int | None = None,
+    ) -> list[DraftRevision] | None:
+        if await self.db.get(FormDraftModel, draft_id) is None:
+            return None
+        return await self.revisions.history(draft_id, limit, before)
+
+    async def get_revision(self, draft_id: str, version: int) -> FormDraft | None:
+        """The draft as it was at `version`."""
+        row = (await self.db.execute(
+            select(FormDraftModel.prompt, FormDraftModel.created_at).where(FormDraftModel.id == draft_id)
+        )).one_or_none()
+        if row is None:
+            return None
+        rebuilt = await self.revisions.document_at(draft_id, version)
+        if rebuilt is None:
+            return None
+        document, written_at = rebuilt
+        return FormDraft(
+            id=draft_id,
+            prompt=row.prompt,
+            version=version,
+            created_at=row.created_at.isoformat(),
+            updated_at=written_at.isoformat(),
+            **document,
+        )
+
+    async def delete_draft(self, draft_id: str) -> bool:
+        model = await self.db.get(FormDraftModel, draft_id)
         if not model:
             return False
-        self.db.delete(model)
-        self.db.commit()
+        await self.db.delete(model)
+        await self.db.commit()
         return True
 
-    def _save(self, draft: FormDraft) -> None:
-        model = FormDraftModel(
+    async def _save(self, draft: FormDraft) -> None:
+        self.db.add(self._to_model(draft))
+        self.revisions.record_created([draft])
+        await self._publish_and_commit(draft)
+
+    async def _write_draft(self, draft_id: str, read_version: int, values: dict) -> None:
+        """UPDATE ... WHERE version = :read_version, so a write that raced
+        ours since we read the draft is detected instead of overwritten."""
+        written = await self.db.scalar(
+            update(FormDraftModel)
+            .where(FormDraftModel.id == draft_id, FormDraftModel.version == read_version)
+            .values(**values)
+            .returning(FormDraftModel.id)
+        )
+        if written is None:
+            await self.db.rollback()
+            raise VersionConflictError(draft_id)
+
+    async def _publish_and_commit(self, draft: FormDraft, autosave: bool = False) -> None:
+        """Writes the pending draft changes and the catalog upsert in a single
+        transaction; expire_on_commit is off, so nothing needs reloading after.
+        Edits pass autosave=True, so republishing stays cheap on every save."""
+        published, rendered = await self.catalog_service.publish(draft, commit=False, autosave=autosave)
+        await self.db.commit()
+        self.catalog_service.cache_published(published.id, rendered)
+
+    def _to_model(self, draft: FormDraft) -> FormDraftModel:
+        return FormDraftModel(
             id=draft.id,
             name=draft.name,
             description=draft.description,
@@ -103,12 +365,10 @@ class FormDesignService:
             created_at=datetime.fromisoformat(draft.created_at),
             updated_at=datetime.fromisoformat(draft.updated_at),
         )
-        self.db.add(model)
-        self.db.commit()
-        self.db.refresh(model)
 
     def _to_schema(self, model: FormDraftModel) -> FormDraft:
-        return FormDraft(
+        # One validation call over the whole row instead of a constructor per field.
+        return FormDraft.model_validate(dict(
             id=model.id,
             name=model.name,
             description=model.description,
@@ -117,8 +377,71 @@ class FormDesignService:
             status=model.status,
             created_at=model.created_at.isoformat(),
             updated_at=model.updated_at.isoformat(),
-            fields=[FormFieldDraft(**f) for f in model.fields],
-            layout=FormLayoutDraft(**model.layout),
-            actions=[FormActionDraft(**a) for a in model.actions],
+            fields=model.fields,
+            layout=model.layout,
+            actions=model.actions,
             css_overrides=model.css_overrides,
-        )
+        ))
+
+
+def _isoformat(column):
+    """Postgres rendering of a naive UTC timestamp column matching
+    datetime.isoformat(), as the other draft endpoints return it: no offset,
+    and no fraction when the microseconds are zero."""
+    fraction = case(
+        (func.date_trunc("second", column) == column, ""),
+        else_=func.to_char(column, ".US"),
+    )
+    return func.to_char(column, 'YYYY-MM-DD"T"HH24:MI:SS').concat(fraction)
+
+
+def _check_version(draft_id: str, version: int, expected_version: int | None) -> None:
+    if expected_version is not None and version != expected_version:
+        raise VersionConflictError(draft_id, version)
+
+
+def _push_jsonb_step(expressions: dict[str, Any], operation: dict, before: dict) -> None:
+    """Extends the SQL expression for the JSONB column an operation touches.
+    Operations with no direct jsonb_* equivalent (move, copy, whole-column
+    or whole-document writes, appends to empty arrays) set the expression of
+    every column they change to None, and those columns are then written in
+    full."""
+    op = operation["op"]
+    if op == "test":
+        return
+    tokens = parse_pointer(operation["path"])
+    if not tokens:
+        expressions.update(dict.fromkeys(expressions))
+        return
+    if op == "move":
+        source = parse_pointer(operation["from"])
+        if source and source[0] in expressions:
+            expressions[source[0]] = None
+    column = tokens[0]
+    if column not in expressions:
+        return
+    expression = expressions[column]
+    if expression is None:
+        return
+    if op in ("move", "copy") or len(tokens) == 1:
+        expressions[column] = None
+        return
+
+    path = literal(tokens[1:], ARRAY(Text))
+    value = literal(operation.get("value"), JSONB)
+    parent = before[column]
+    for token in tokens[1:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+
+    if op == "remove":
+        expressions[column] = expression.op("#-")(path)
+    elif op == "replace" or not isinstance(parent, list):
+        # replace, or add of an object member (which may create it)
+        expressions[column] = func.jsonb_set(expression, path, value, op == "add", type_=JSONB)
+    elif tokens[-1] != "-":
+        expressions[column] = func.jsonb_insert(expression, path, value, type_=JSONB)
+    elif parent:
+        last = literal(tokens[1:-1] + [str(len(parent) - 1)], ARRAY(Text))
+        expressions[column] = func.jsonb_insert(expression, last, value, True, type_=JSONB)
+    else:
+        expressions[column] = None
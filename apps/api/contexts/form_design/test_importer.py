@@ -0,0 +1,92 @@
+"""Unit tests for the NDJSON importer's line handling and per-line error reporting."""
+import asyncio
+import json
+from types import SimpleNamespace
+
+from sqlalchemy.exc import OperationalError
+
+from contexts.form_design.importer import DraftImporter, split_lines
+from contexts.form_design.schemas import DraftImportResult
+
+
+def _draft_json(**overrides) -> str:
+    draft = {
+        "id": "d1",
+        "name": "Contact",
+        "prompt": "legacy",
+        "created_at": "2026-01-01T00:00:00+00:00",
+        "updated_at": "2026-01-01T00:00:00+00:00",
+        "fields": [{"key": "email", "type": "email", "label": "Email"}],
+        "layout": {"columns": 1},
+        "actions": [{"type": "submit"}],
+    }
+    return json.dumps({**draft, **overrides})
+
+
+def test_split_lines_reassembles_lines_across_chunks():
+    async def chunks():
+        for chunk in [b'{"a"', b': 1}\n{"b": 2}\n{"c"', b": 3}"]:
+            yield chunk
+
+    async def collect():
+        return [line async for line in split_lines(chunks())]
+
+    assert asyncio.run(collect()) == [b'{"a": 1}', b'{"b": 2}', b'{"c": 3}']
+
+
+def test_parse_accepts_valid_draft():
+    result = DraftImportResult()
+    draft = DraftImporter(db=None)._parse(1, _draft_json(), result)
+    assert draft is not None and draft.id == "d1"
+    assert result.errors == []
+
+
+def test_parse_reports_malformed_json_by_line():
+    result = DraftImportResult()
+    assert DraftImporter(db=None)._parse(7, "{not json", result) is None
+    assert result.errors[0].line == 7
+    assert result.errors[0].draft_id is None
+
+
+def test_parse_reports_validator_errors_with_draft_id():
+    result = DraftImportResult()
+    assert DraftImporter(db=None)._parse(3, _draft_json(name=" "), result) is None
+    assert result.errors[0].line == 3
+    assert result.errors[0].draft_id == "d1"
+    assert result.errors[0].errors[0].field == "name"
+
+
+class FlakySession:
+    """Accepts every chunk except the first, which the database rejects."""
+
+    def __init__(self):
+        self.rejected = False
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def scalars(self, stmt, rows):
+        if not self.rejected:
+            self.rejected = True
+            raise OperationalError("INSERT INTO form_drafts ...", {}, Exception("connection reset"))
+        return SimpleNamespace(all=lambda: [row["id"] for row in rows])
+
+    async def execute(self, stmt, rows):
+        pass
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def test_bad_utf8_and_rejected_chunks_are_reported_by_line():
+    session = FlakySession()
+    lines = [_draft_json(id="d1").encode(), b'{"id": "\xff"}', _draft_json(id="d3").encode()]
+
+    result = asyncio.run(DraftImporter(db=session, chunk_size=1).import_lines(lines))
+
+    assert result.imported == 1
+    assert [(e.line, e.errors[0].field) for e in result.errors] == [(1, "draft"), (2, "body")]
+    assert "connection reset" in result.errors[0].errors[0].message
+    assert (session.rollbacks, session.commits) == (1, 1)
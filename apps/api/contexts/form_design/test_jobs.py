@@ -0,0 +1,73 @@
+"""Unit tests for generation job claiming, lease retries and worker resilience."""
+import asyncio
+from datetime import datetime, timezone
+
+import contexts.form_design.jobs as jobs
+from contexts.form_design.jobs import JobWorkerPool, _take
+from contexts.form_design.models import GenerationJobModel
+
+NOW = datetime(2026, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _job(status: str, attempts: int) -> GenerationJobModel:
+    return GenerationJobModel(id="j1", kind="generate", status=status, payload={}, attempts=attempts)
+
+
+def test_pending_job_is_taken_for_first_attempt():
+    job = _job("pending", 0)
+    assert _take(job, NOW)
+    assert (job.status, job.attempts, job.started_at) == ("running", 1, NOW)
+
+
+def test_lost_job_is_retried_while_attempts_remain(monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_MAX_ATTEMPTS", 3)
+    job = _job("running", 2)
+    assert _take(job, NOW)
+    assert (job.status, job.attempts) == ("running", 3)
+
+
+def test_lost_job_out_of_attempts_is_failed(monkeypatch):
+    monkeypatch.setattr(jobs, "JOB_MAX_ATTEMPTS", 3)
+    job = _job("running", 3)
+    assert not _take(job, NOW)
+    assert (job.status, job.attempts, job.finished_at) == ("failed", 3, NOW)
+    assert job.errors[0]["field"] == "job"
+
+
+class ScriptedPool(JobWorkerPool):
+    """Claims scripted job ids and records executions instead of using the database."""
+
+    def __init__(self, claims: list, fail_on: set[str]):
+        super().__init__(services=None, workers=1, poll_interval=0)
+        self.claims = list(claims)
+        self.fail_on = fail_on
+        self.executed: list[str] = []
+        self.done = asyncio.Event()
+
+    async def _claim(self) -> tuple[str, int] | None:
+        if not self.claims:
+            self.done.set()
+            return None
+        claim = self.claims.pop(0)
+        if isinstance(claim, Exception):
+            raise claim
+        return claim, 1
+
+    async def _execute(self, job_id: str, attempt: int) -> None:
+        self.executed.append(job_id)
+        if job_id in self.fail_on:
+            raise ConnectionError("database went away")
+
+
+def test_worker_survives_claim_and_execute_errors(caplog):
+    pool = ScriptedPool(["a", ConnectionError("no database"), "b", "c"], fail_on={"b"})
+
+    async def run():
+        task = asyncio.create_task(pool._run())
+        await asyncio.wait_for(pool.done.wait(), timeout=5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(run())
+    assert pool.executed == ["a", "b", "c"]
+    assert caplog.text.count("Generation job worker failed") == 2
@@ -0,0 +1,91 @@
+"""Unit tests for RFC 6902 JSON Patch application."""
+import pytest
+
+from contexts.form_design.json_patch import apply_patch, diff, parse_pointer
+from shared.errors import PatchError
+
+
+def test_pointer_unescapes_tokens():
+    assert parse_pointer("/a~1b/m~0n/0") == ["a/b", "m~n", "0"]
+    assert parse_pointer("") == []
+
+
+def test_add_replace_remove():
+    doc = {"fields": [{"key": "a"}, {"key": "b"}]}
+    patched = apply_patch(doc, [
+        {"op": "add", "path": "/fields/1", "value": {"key": "x"}},
+        {"op": "add", "path": "/fields/-", "value": {"key": "z"}},
+        {"op": "replace", "path": "/fields/0/key", "value": "a2"},
+        {"op": "remove", "path": "/fields/2"},
+    ])
+    assert patched == {"fields": [{"key": "a2"}, {"key": "x"}, {"key": "z"}]}
+
+
+def test_input_document_is_not_modified():
+    doc = {"fields": [{"key": "a"}]}
+    apply_patch(doc, [{"op": "replace", "path": "/fields/0/key", "value": "b"}])
+    assert doc == {"fields": [{"key": "a"}]}
+
+
+def test_move_and_copy():
+    doc = {"fields": [1, 2, 3], "layout": {}}
+    patched = apply_patch(doc, [
+        {"op": "move", "from": "/fields/0", "path": "/fields/-"},
+        {"op": "copy", "from": "/fields/0", "path": "/layout/first"},
+    ])
+    assert patched == {"fields": [2, 3, 1], "layout": {"first": 2}}
+
+
+def test_failed_test_aborts_whole_patch():
+    doc = {"name": "Contact"}
+    with pytest.raises(PatchError) as e:
+        apply_patch(doc, [
+            {"op": "replace", "path": "/name", "value": "Other"},
+            {"op": "test", "path": "/name", "value": "Contact"},
+        ])
+    assert e.value.errors[0].field == "/name"
+    assert doc == {"name": "Contact"}
+
+
+@pytest.mark.parametrize("operation", [
+    {"op": "replace", "path": "/missing", "value": 1},
+    {"op": "remove", "path": "/fields/5"},
+    {"op": "add", "path": "/fields/01", "value": 1},
+    {"op": "replace", "path": "/fields/-", "value": 1},
+    {"op": "move", "from": "/fields", "path": "/fields/0"},
+    {"op": "add", "path": "fields", "value": 1},
+])
+def test_invalid_operations_raise(operation):
+    with pytest.raises(PatchError):
+        apply_patch({"fields": [1]}, [operation])
+
+
+def _fields(*keys: str) -> list[dict]:
+    return [{"key": k, "label": k.title()} for k in keys]
+
+
+@pytest.mark.parametrize("source,target", [
+    ({"fields": _fields("a", "b", "c")}, {"fields": _fields("a", "x", "b", "c")}),
+    ({"fields": _fields("a", "b", "c")}, {"fields": _fields("a", "c")}),
+    ({"fields": _fields("a", "b")}, {"fields": _fields("b", "a")}),
+    ({"fields": _fields("a")}, {"fields": []}),
+    ({"layout": {"columns": 1}}, {"layout": {"columns": 2, "gap": "8px"}}),
+    ({"name": "A", "description": "x"}, {"name": "A", "description": None}),
+    ({"a/b": 1, "m~n": 2}, {"a/b": 3}),
+])
+def test_diff_round_trips(source, target):
+    assert apply_patch(source, diff(source, target)) == target
+
+
+def test_diff_of_one_field_edit_in_long_list_is_one_operation():
+    fields = _fields(*(f"f{i}" for i in range(200)))
+    inserted = fields[:100] + _fields("new") + fields[100:]
+    edited = [dict(f) for f in fields]
+    edited[150]["label"] = "Changed"
+
+    assert diff({"fields": fields}, {"fields": inserted}) == [
+        {"op": "add", "path": "/fields/100", "value": {"key": "new", "label": "New"}},
+    ]
+    assert diff({"fields": fields}, {"fields": edited}) == [
+        {"op": "replace", "path": "/fields/150/label", "value": "Changed"},
+    ]
@@ -0,0 +1,184 @@
+"""Router tests for PATCH /design/drafts/{id} (If-Match parsing, 409s, JSON Patch writes) and the
+generation stream's error events."""
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from openai import APIConnectionError
+from sqlalchemy import Select
+
+from contexts.form_catalog.cache import RenderableCache
+from contexts.form_design.models import FormDraftModel
+from contexts.form_design.router import get_service, router
+from contexts.form_design.rules import RuleSet
+from contexts.form_design.service import JSONB_MEMBERS, PATCHABLE_MEMBERS, FormDesignService, _push_jsonb_step
+from contexts.form_design.validator import FormDraftValidator
+from contexts.generation.resilience import CircuitOpenError
+from contexts.generation.schemas import LLMField
+
+NOW = datetime(2026, 1, 1, 12, 0, 0)
+
+
+class FakeSession:
+    """Stands in for the AsyncSession behind one stored draft at version 3.
+    With concurrent_write, the conditional UPDATE matches no row, as when
+    another write lands between reading and writing the draft."""
+
+    def __init__(self, concurrent_write: bool = False):
+        self.concurrent_write = concurrent_write
+        self.committed = False
+        self.written: dict | None = None
+        self.draft = FormDraftModel(
+            id="d1", name="Contact", description=None, prompt="contact form", version=3, status="saved",
+            fields=[{"key": "email", "type": "email", "label": "Email"}],
+            layout={"columns": 1}, actions=[{"type": "submit", "label": "Submit"}], css_overrides=None,
+            created_at=NOW, updated_at=NOW,
+        )
+
+    async def get(self, model, key):
+        return self.draft if key == self.draft.id else None
+
+    async def scalar(self, stmt):
+        # UPDATE form_drafts ... WHERE version = :read RETURNING id
+        self.written = stmt.compile().params
+        return None if self.concurrent_write else self.draft.id
+
+    async def execute(self, stmt):
+        if isinstance(stmt, Select):
+            # patch_draft's read of the patchable columns
+            names = ("id", "prompt", "version", "status", "created_at", *PATCHABLE_MEMBERS)
+            row = SimpleNamespace(**{name: getattr(self.draft, name) for name in names})
+            return SimpleNamespace(one_or_none=lambda: row)
+        # The catalog upsert ... RETURNING id, published_at
+        row = SimpleNamespace(id="p1", published_at=NOW)
+        return SimpleNamespace(one=lambda: row)
+
+    def add(self, instance):
+        pass
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+def _client(session: FakeSession, generation_service: object = None) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+
+    def service() -> FormDesignService:
+        design = FormDesignService(
+            session, generation_service=generation_service or object(), validator=FormDraftValidator(RuleSet([])),
+        )
+        design.catalog_service.renderable_cache = RenderableCache(ttl_seconds=60, max_entries=10)
+        return design
+
+    app.dependency_overrides[get_service] = service
+    return TestClient(app)
+
+
+def _patch(session: FakeSession, if_match: str | None):
+    headers = {"If-Match": if_match} if if_match is not None else {}
+    return _client(session).patch("/design/drafts/d1", json={"name": "Renamed"}, headers=headers)
+
+
+@pytest.mark.parametrize("if_match", ['"3"', 'W/"3"', " \"3\" ", "*", None])
+def test_matching_or_unconditional_if_match_updates(if_match):
+    session = FakeSession()
+    response = _patch(session, if_match)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] == '"4"'
+    assert response.json()["name"] == "Renamed"
+    assert session.committed
+
+
+def test_stale_if_match_is_409_with_current_etag():
+    session = FakeSession()
+    response = _patch(session, '"2"')
+
+    assert response.status_code == 409
+    assert response.headers["ETag"] == '"3"'
+    assert not session.committed
+
+
+def test_write_racing_the_update_is_409():
+    session = FakeSession(concurrent_write=True)
+    response = _patch(session, '"3"')
+
+    assert response.status_code == 409
+    assert "modified by another request" in response.json()["detail"]
+    assert not session.committed
+
+
+@pytest.mark.parametrize("if_match", ['"abc"', "garbage", '"-1"', '""'])
+def test_malformed_if_match_is_400(if_match):
+    response = _patch(FakeSession(), if_match)
+
+    assert response.status_code == 400
+
+
+def _json_patch(session: FakeSession, operations: list[dict]):
+    return _client(session).patch("/design/drafts/d1/json-patch", json=operations)
+
+
+def test_root_replace_writes_every_changed_column():
+    session = FakeSession()
+    document = {
+        "name": "Callback", "description": None, "css_overrides": None,
+        # Already in stored form, as a client echoing a fetched draft sends it.
+        "fields": [{
+            "key": "phone", "type": "tel", "label": "Phone", "placeholder": None, "hint": None,
+            "default_value": None, "validators": [], "options": [], "layout": None, "conditional": None,
+        }],
+        "layout": {"columns": 2, "gap": None, "breakpoints": None},
+        "actions": [{"type": "submit", "label": "Call me", "color": None}],
+    }
+    response = _json_patch(session, [{"op": "replace", "path": "", "value": document}])
+
+    assert response.status_code == 200
+    assert [f["key"] for f in response.json()["fields"]] == ["phone"]
+    assert session.written["name"] == "Callback"
+    assert [f["key"] for f in session.written["fields"]] == ["phone"]
+    assert session.written["layout"]["columns"] == 2
+    assert session.written["actions"][0]["label"] == "Call me"
+
+
+def test_move_between_columns_drops_both_column_expressions():
+    expressions = {name: getattr(FormDraftModel, name) for name in JSONB_MEMBERS}
+    before = {"fields": [{"key": "a"}, {"key": "b"}], "layout": {"columns": 1}, "actions": []}
+    _push_jsonb_step(expressions, {"op": "move", "from": "/fields/1", "path": "/actions/-"}, before)
+
+    assert expressions["fields"] is None
+    assert expressions["actions"] is None
+    assert expressions["layout"] is not None
+
+
+class FailingStream:
+    """Generation service whose stream yields one field, then fails upstream."""
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+    async def generate_stream(self, prompt: str):
+        yield LLMField(key="email", type="email", label="Email")
+        raise self.error
+
+
+@pytest.mark.parametrize("error", [
+    APIConnectionError(request=httpx.Request("POST", "https://llm.invalid/v1/chat/completions")),
+    TimeoutError(),
+    CircuitOpenError("All LLM providers have open circuits"),
+])
+def test_upstream_failure_mid_stream_ends_with_error_event(error):
+    client = _client(FakeSession(), generation_service=FailingStream(error))
+    response = client.post("/design/generate/stream", json={"prompt": "contact form"})
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["event"] for e in events] == ["field", "error"]
+    assert events[-1]["data"][0]["field"] == "llm"
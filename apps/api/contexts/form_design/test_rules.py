@@ -0,0 +1,106 @@
+"""Unit tests for the declarative draft rule engine."""
+import json
+
+import pytest
+
+import contexts.form_design.rules as rules_module
+from contexts.form_design.importer import DraftImporter
+from contexts.form_design.rules import RuleSet
+from contexts.form_design.schemas import ConditionalConfig
+from contexts.form_design.test_validator import _draft, _field
+from contexts.form_design.validator import FormDraftValidator
+from shared.errors import DraftValidationError
+
+
+def _fields(errors) -> list[str]:
+    return [e.field for e in errors]
+
+
+def test_empty_rule_set_reports_nothing():
+    assert RuleSet([]).evaluate(_draft()) == []
+
+
+def test_max_fields():
+    rules = RuleSet([{"id": "max", "kind": "max_fields", "max": 2}])
+    assert rules.evaluate(_draft(fields=[_field("a"), _field("b")])) == []
+    assert _fields(rules.evaluate(_draft(fields=[_field("a"), _field("b"), _field("c")]))) == ["fields"]
+
+
+def test_banned_types():
+    rules = RuleSet([{"id": "no-passwords", "kind": "banned_types", "types": ["password"]}])
+    errors = rules.evaluate(_draft(fields=[_field("a"), _field("secret", type_="password")]))
+    assert _fields(errors) == ["fields.secret.type"]
+    assert "password" in errors[0].message
+
+
+def test_key_pattern_with_custom_message():
+    rules = RuleSet([{
+        "id": "snake", "kind": "key_pattern", "pattern": "[a-z][a-z0-9_]{1,}",
+        "message": "Key {key} must be snake_case.",
+    }])
+    errors = rules.evaluate(_draft(fields=[_field("first_name"), _field("LastName")]))
+    assert [(e.field, e.message) for e in errors] == [("fields.LastName.key", "Key LastName must be snake_case.")]
+
+
+def test_conditional_reference_sees_fields_declared_later():
+    rules = RuleSet([{"id": "cond", "kind": "conditional_reference"}])
+    when = lambda target: ConditionalConfig(field=target, operator="==", value="yes")
+    draft = _draft(fields=[
+        _field("details", conditional=when("has_details")),
+        _field("has_details"),
+        _field("other", conditional=when("missing")),
+    ])
+    assert _fields(rules.evaluate(draft)) == ["fields.other.conditional.field"]
+
+
+def test_field_errors_in_field_order_then_draft_errors():
+    rules = RuleSet([
+        {"id": "max", "kind": "max_fields", "max": 1},
+        {"id": "no-passwords", "kind": "banned_types", "types": ["password"]},
+        {"id": "snake", "kind": "key_pattern", "pattern": "[a-z_]+"},
+    ])
+    draft = _draft(fields=[_field("Secret", type_="password"), _field("ok"), _field("B")])
+    assert _fields(rules.evaluate(draft)) == [
+        "fields.Secret.type", "fields.Secret.key", "fields.B.key", "fields",
+    ]
+
+
+def test_stats_count_evaluations_and_violations_per_rule():
+    rules = RuleSet([
+        {"id": "no-passwords", "kind": "banned_types", "types": ["password"]},
+        {"id": "max", "kind": "max_fields", "max": 10},
+    ])
+    rules.evaluate(_draft(fields=[_field("a", type_="password")]))
+    rules.evaluate(_draft(fields=[_field("a")]))
+    stats = {s.id: s for s in rules.stats()}
+    assert (stats["no-passwords"].evaluations, stats["no-passwords"].violations) == (2, 1)
+    assert (stats["max"].evaluations, stats["max"].violations) == (2, 0)
+    assert all(s.seconds >= 0 for s in stats.values())
+
+
+def test_unknown_kind_and_duplicate_ids_are_rejected():
+    with pytest.raises(ValueError):
+        RuleSet([{"id": "x", "kind": "nope"}])
+    with pytest.raises(ValueError):
+        RuleSet([{"id": "x", "kind": "max_fields", "max": 1}, {"id": "x", "kind": "max_fields", "max": 2}])
+
+
+def test_validator_reports_rule_errors_after_invariants():
+    validator = FormDraftValidator(RuleSet([{"id": "no-passwords", "kind": "banned_types", "types": ["password"]}]))
+    draft = _draft(name="", fields=[_field("secret", type_="password")])
+    with pytest.raises(DraftValidationError) as exc_info:
+        validator.validate(draft)
+    assert _fields(exc_info.value.errors) == ["name", "fields.secret.type"]
+
+
+def test_validators_default_to_rules_file(tmp_path, monkeypatch):
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps([{"id": "no-passwords", "kind": "banned_types", "types": ["password"]}]))
+    monkeypatch.setattr(rules_module, "DRAFT_RULES_FILE", str(rules_file))
+
+    # What import_drafts.py builds: no validator passed.
+    validator = DraftImporter(db=None).validator
+    with pytest.raises(DraftValidationError) as exc_info:
+        validator.validate(_draft(fields=[_field("secret", type_="password")]))
+    assert _fields(exc_info.value.errors) == ["fields.secret.type"]
+    assert len(FormDraftValidator(RuleSet([])).rules) == 0
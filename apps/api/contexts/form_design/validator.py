@@ -1,9 +1,15 @@
+from contexts.form_design.rules import RuleSet, build_rule_set
 from contexts.form_design.schemas import FormDraft
 from shared.errors import DraftValidationError, FieldValidationError
 
 
 class FormDraftValidator:
-    """Enforces domain invariants on FormDraft. Runs on every write — source agnostic."""
+    """Enforces domain invariants on FormDraft. Runs on every write — source agnostic.
+    Deployment-specific rules, DRAFT_RULES_FILE's unless given, are checked
+    after the invariants."""
+
+    def __init__(self, rules: RuleSet | None = None):
+        self.rules = rules if rules is not None else build_rule_set()
 
     def validate(self, draft: FormDraft) -> None:
         errors: list[FieldValidationError] = []
@@ -53,5 +59,7 @@ class FormDraftValidator:
                 message="Draft must have at least one action.",
             ))
 
+        errors.extend(self.rules.evaluate(draft))
+
         if errors:
             raise DraftValidationError(errors)
@@ -0,0 +1,174 @@
+"""Content-addressed cache for LLM generation output.
+
+Keys combine the normalized prompt, the model id and a hash of SYSTEM_PROMPT,
+so editing the system prompt or switching models never serves stale output.
+"""
+import hashlib
+import os
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from contexts.generation.models import GenerationCacheModel
+from contexts.generation.schemas import LLMFormOutput
+from shared.database import AsyncSessionLocal
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Case- and whitespace-insensitive form of a prompt."""
+    return re.sub(r"\s+", " ", prompt).strip().lower()
+
+
+def cache_key(prompt: str, model: str, system_prompt: str) -> str:
+    system_hash = hashlib.sha256(system_prompt.encode()).hexdigest()
+    material = "\x1f".join([normalize_prompt(prompt), model, system_hash])
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+class GenerationCache(ABC):
+    """Base class for cache backends. Subclasses implement _load and _store;
+    hit/miss accounting lives here so every backend reports the same way.
+    The counters are per process and served by GET /design/generation-cache."""
+
+    backend: str
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    async def get(self, key: str) -> LLMFormOutput | None:
+        output = await self._load(key)
+        if output is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+        return output
+
+    async def set(self, key: str, output: LLMFormOutput) -> None:
+        await self._store(key, output)
+
+    @abstractmethod
+    async def _load(self, key: str) -> LLMFormOutput | None:
+        """The cached output for key, or None when absent or expired."""
+
+    @abstractmethod
+    async def _store(self, key: str, output: LLMFormOutput) -> None:
+        """Caches output under key, evicting as the backend's bounds require."""
+
+
+class InMemoryGenerationCache(GenerationCache):
+    """Per-process LRU cache with a fixed TTL."""
+
+    backend = "memory"
+
+    def __init__(self, ttl_seconds: float, max_entries: int, clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, LLMFormOutput]] = OrderedDict()
+
+    async def _load(self, key: str) -> LLMFormOutput | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, output = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return output
+
+    async def _store(self, key: str, output: LLMFormOutput) -> None:
+        self._entries[key] = (self._clock() + self.ttl_seconds, output)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class PostgresGenerationCache(GenerationCache):
+    """Cache backed by the generation_cache table, shared across workers.
+    LRU order is tracked through last_accessed_at."""
+
+    backend = "postgres"
+
+    def __init__(self, ttl_seconds: float, max_entries: int, session_factory=AsyncSessionLocal):
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._session_factory = session_factory
+
+    async def _load(self, key: str) -> LLMFormOutput | None:
+        now = _utcnow()
+        async with self._session_factory() as db:
+            row = await db.get(GenerationCacheModel, key)
+            if row is None:
+                return None
+            if row.expires_at <= now:
+                await db.delete(row)
+                await db.commit()
+                return None
+            row.last_accessed_at = now
+            await db.commit()
+            return LLMFormOutput(**row.output)
+
+    async def _store(self, key: str, output: LLMFormOutput) -> None:
+        now = _utcnow()
+        values = dict(
+            key=key,
+            output=output.model_dump(),
+            created_at=now,
+            expires_at=now + timedelta(seconds=self.ttl_seconds),
+            last_accessed_at=now,
+        )
+        stmt = insert(GenerationCacheModel).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[GenerationCacheModel.key],
+            set_={k: stmt.excluded[k] for k in values if k != "key"},
+        )
+        async with self._session_factory() as db:
+            await db.execute(stmt)
+            await db.execute(delete(GenerationCacheModel).where(GenerationCacheModel.expires_at <= now))
+            overflow = (
+                select(GenerationCacheModel.key)
+                .order_by(GenerationCacheModel.last_accessed_at.desc())
+                .offset(self.max_entries)
+            )
+            await db.execute(delete(GenerationCacheModel).where(GenerationCacheModel.key.in_(overflow)))
+            await db.commit()
+
+
+def _utcnow() -> datetime:
+    # generation_cache stores naive UTC timestamps, like the other tables.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def build_generation_cache() -> GenerationCache | None:
+    """Builds the cache backend selected by LLM_CACHE_BACKEND (memory, postgres or off)."""
+    backend = os.getenv("LLM_CACHE_BACKEND", "memory").lower()
+    ttl_seconds = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+    max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+    if backend == "memory":
+        return InMemoryGenerationCache(ttl_seconds, max_entries)
+    if backend == "postgres":
+        return PostgresGenerationCache(ttl_seconds, max_entries)
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_generation_cache() -> GenerationCache | None:
+    """Process-wide cache instance, shared by every GenerationService."""
+    return build_generation_cache()
@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import JSONB
+from shared.database import Base, UTCDateTime
+
+
+class GenerationCacheModel(Base):
+    __tablename__ = "generation_cache"
+
+    key: Mapped[str] = mapped_column(String, primary_key=True)
+    output: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(UTCDateTime, default=datetime.utcnow)
+    expires_at: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False, index=True)
+    last_accessed_at: Mapped[datetime] = mapped_column(UTCDateTime, default=datetime.utcnow, index=True)
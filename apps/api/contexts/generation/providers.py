@@ -0,0 +1,168 @@
+"""Pool of OpenAI-compatible LLM endpoints with latency-aware routing.
+
+Each provider keeps exponentially weighted moving averages of its latency and
+error rate; calls go to the provider with the lowest expected time to a
+successful answer, skipping any whose circuit breaker is open.
+"""
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator
+import httpx
+from openai import AsyncOpenAI
+from contexts.generation.resilience import CircuitBreaker, CircuitOpenError
+
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "30"))
+LLM_ROUTING_EWMA_ALPHA = float(os.getenv("LLM_ROUTING_EWMA_ALPHA", "0.2"))
+
+logger = logging.getLogger(__name__)
+
+
+class LLMProvider:
+    def __init__(self, name: str, client, model: str, max_concurrency: int, breaker: CircuitBreaker):
+        self.name = name
+        self.client = client
+        self.model = model
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.breaker = breaker
+        self.latency_ewma: float | None = None
+        self.error_ewma = 0.0
+
+    @property
+    def score(self) -> float:
+        """Expected seconds to a successful answer; untried providers score 0
+        so every endpoint gets probed once."""
+        if self.latency_ewma is None:
+            return 0.0
+        return self.latency_ewma / max(1.0 - self.error_ewma, 0.05)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Holds a concurrency slot for one call. The breaker is asked only
+        once the slot is held, so a call still queued for a slot never holds
+        the half-open trial; a trial whose call is cancelled or closed before
+        recording an outcome is given back. Raises CircuitOpenError if the
+        breaker no longer admits the call."""
+        async with self.slots:
+            trial = self.breaker.state == "half_open"
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"LLM provider {self.name!r} has an open circuit")
+            try:
+                yield
+            except (asyncio.CancelledError, GeneratorExit):
+                if trial:
+                    self.breaker.release()
+                raise
+
+    def record_success(self, seconds: float) -> None:
+        alpha = LLM_ROUTING_EWMA_ALPHA
+        self.latency_ewma = seconds if self.latency_ewma is None else alpha * seconds + (1 - alpha) * self.latency_ewma
+        self.error_ewma = (1 - alpha) * self.error_ewma
+        self.breaker.record_success()
+
+    def record_failure(self) -> None:
+        alpha = LLM_ROUTING_EWMA_ALPHA
+        self.error_ewma = alpha + (1 - alpha) * self.error_ewma
+        self.breaker.record_failure()
+
+
+class ProviderPool:
+    def __init__(self, providers: list[LLMProvider]):
+        self.providers = providers
+
+    def __len__(self) -> int:
+        return len(self.providers)
+
+    @property
+    def model_key(self) -> str:
+        """Identifies the pool's models for generation cache keys."""
+        return "+".join(sorted({p.model for p in self.providers}))
+
+    def select(self, exclude: set[str] = frozenset()) -> LLMProvider:
+        """Best-scoring provider whose breaker would admit a call. Providers
+        with a free concurrency slot and not in `exclude` are preferred; the
+        rest are used only as a last resort. The breaker itself is consulted
+        by LLMProvider.acquire. Raises CircuitOpenError if every breaker is
+        open."""
+        def rank(p: LLMProvider):
+            return (p.name in exclude, p.slots.locked(), p.score)
+
+        for provider in sorted(self.providers, key=rank):
+            if provider.breaker.available():
+                return provider
+        raise CircuitOpenError("All LLM providers have open circuits")
+
+    def has_alternative(self, exclude: set[str]) -> bool:
+        return any(p.name not in exclude and p.breaker.state != "open" for p in self.providers)
+
+
+def _breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        failure_threshold=int(os.getenv("LLM_BREAKER_FAILURE_THRESHOLD", "5")),
+        reset_timeout=float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30")),
+    )
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """Keep-alive connection pool shared by every provider client, so TLS
+    sessions and HTTP/2 connections are reused across requests."""
+    http2 = os.getenv("LLM_HTTP2", "true").lower() == "true"
+    if http2:
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            logger.warning("LLM_HTTP2 is enabled but the h2 package is missing; using HTTP/1.1 keep-alive")
+            http2 = False
+    max_connections = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "200"))
+    return httpx.AsyncClient(
+        http2=http2,
+        timeout=LLM_TIMEOUT_SECONDS,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=float(os.getenv("LLM_HTTP_KEEPALIVE_SECONDS", "60")),
+        ),
+    )
+
+
+def build_provider_pool(http_client: httpx.AsyncClient | None = None) -> ProviderPool:
+    """Reads LLM_PROVIDERS, a JSON list of {name, base_url, model, api_key_env,
+    max_concurrency}; without it, a single provider from GEMINI_API_KEY,
+    LLM_BASE_URL and LLM_MODEL. Providers without an API key are skipped, so
+    an empty pool means stub generation."""
+    default_concurrency = int(os.getenv("LLM_MAX_CONCURRENCY", "256"))
+    raw = os.getenv("LLM_PROVIDERS")
+    specs = json.loads(raw) if raw else [{
+        "name": "default",
+        "base_url": os.getenv("LLM_BASE_URL"),
+        "model": os.getenv("LLM_MODEL", "gemini-2.5-flash"),
+    }]
+
+    providers = []
+    for spec in specs:
+        api_key = os.getenv(spec.get("api_key_env", "GEMINI_API_KEY"))
+        if not api_key:
+            continue
+        # Retries are driven by GenerationService so they share the breaker's view of the provider.
+        client = AsyncOpenAI(
+            api_key=api_key, base_url=spec.get("base_url"), timeout=LLM_TIMEOUT_SECONDS, max_retries=0,
+            http_client=http_client,
+        )
+        providers.append(LLMProvider(
+            name=spec["name"],
+            client=client,
+            model=spec["model"],
+            max_concurrency=int(spec.get("max_concurrency", default_concurrency)),
+            breaker=_breaker(),
+        ))
+    return ProviderPool(providers)
+
+
+@lru_cache(maxsize=None)
+def get_provider_pool() -> ProviderPool:
+    """Process-wide pool for code running outside the API lifespan (scripts,
+    standalone workers), so routing statistics survive across calls."""
+    return build_provider_pool()
@@ -1,8 +1,17 @@
+import asyncio
 import json
 import os
-from openai import OpenAI
+import time
+from contextlib import aclosing
+from typing import AsyncIterator
+from openai import APIConnectionError, APIError, APITimeoutError, InternalServerError, RateLimitError
 from pydantic import ValidationError
-from contexts.generation.schemas import LLMFormOutput
+from contexts.generation.cache import GenerationCache, cache_key, get_generation_cache
+from contexts.generation.providers import LLMProvider, ProviderPool, LLM_TIMEOUT_SECONDS, get_provider_pool
+from contexts.generation.resilience import CircuitOpenError, LatencyTracker, RetryPolicy
+from contexts.generation.schemas import LLMField, LLMFormOutput
+from contexts.generation.singleflight import SingleFlight
+from contexts.generation.stream_parser import FieldStreamParser
 from shared.errors import GenerationOutputError
 
 SYSTEM_PROMPT = """You are a form schema generator. Given a plain English description of a form, return a JSON object matching this schema exactly (no markdown, no commentary — raw JSON only):
@@ -34,28 +43,242 @@ Rules:
 - Return ONLY the JSON object — no other text
 """
 
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "false").lower() == "true"
+# Hedging waits for this many latency samples before trusting the p95.
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+# Upstream failures worth another attempt. GenerationOutputError is retried too,
+# but says nothing about provider health and never counts against a provider.
+TRANSIENT_ERRORS = (
+    APIConnectionError, APITimeoutError, InternalServerError, RateLimitError, asyncio.TimeoutError,
+)
+# Every way an upstream call can fail other than with unusable output.
+UPSTREAM_ERRORS = (*TRANSIENT_ERRORS, APIError, CircuitOpenError)
+
 
 class GenerationService:
-    def __init__(self):
-        api_key = os.getenv("GEMINI_API_KEY")
-        base_url = os.getenv("LLM_BASE_URL")
-        self.model = os.getenv("LLM_MODEL", "gemini-2.5-flash")
-        self.client = OpenAI(api_key=api_key, base_url=base_url) if api_key else None
-
-    def generate(self, prompt: str) -> LLMFormOutput:
-        if not self.client:
-            return self._stub(prompt)
+    """Application-scoped: one instance serves every request, so the
+    single-flight table and latency window below see all in-flight traffic."""
 
-        response = self.client.chat.completions.create(
-            model=self.model,
-            max_tokens=2048,
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                {"role": "user", "content": prompt},
-            ],
+    def __init__(self, cache: GenerationCache | None = None, providers: ProviderPool | None = None):
+        self.providers = providers if providers is not None else get_provider_pool()
+        self.model = self.providers.model_key
+        self.cache = cache if cache is not None else get_generation_cache()
+        self.retry = RetryPolicy(
+            max_attempts=int(os.getenv("LLM_RETRY_ATTEMPTS", "3")),
+            base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY_SECONDS", "0.5")),
+            max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY_SECONDS", "8")),
         )
-        raw = response.choices[0].message.content.strip()
+        self.latency = LatencyTracker()
+        # Identical prompts arriving on different requests coalesce into one upstream call.
+        self._in_flight: SingleFlight[LLMFormOutput] = SingleFlight()
+
+    async def generate(self, prompt: str) -> LLMFormOutput:
+        if not self.providers:
+            return self._stub(prompt)
+
+        key = cache_key(prompt, self.model, SYSTEM_PROMPT)
+        if self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        try:
+            return await self._in_flight.do(key, lambda: self._complete_and_store(key, prompt))
+        except CircuitOpenError:
+            # Degraded fallback; deliberately never cached.
+            return self._stub(prompt)
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[LLMField | LLMFormOutput]:
+        """Yields each LLMField as soon as the streamed completion closes it,
+        then the complete LLMFormOutput. Cached and stub output are replayed
+        the same way so callers handle a single event shape. Until the first
+        field is yielded, failed attempts are retried like _complete's; after
+        that an upstream error ends the stream."""
+        output = None
+        if not self.providers:
+            output = self._stub(prompt)
+        else:
+            key = cache_key(prompt, self.model, SYSTEM_PROMPT)
+            if self.cache is not None:
+                output = await self.cache.get(key)
+
+        if output is None:
+            attempt = 0
+            failed: set[str] = set()
+            while True:
+                attempt += 1
+                try:
+                    provider = self.providers.select(exclude=failed)
+                except CircuitOpenError:
+                    output = self._stub(prompt)
+                    break
+                parser = FieldStreamParser()
+                streamed = False
+                try:
+                    async with aclosing(self._stream_attempt(prompt, provider, parser)) as fields:
+                        async for field in fields:
+                            streamed = True
+                            yield field
+                    break
+                except TRANSIENT_ERRORS:
+                    if streamed or attempt >= self.retry.max_attempts:
+                        raise
+                    failed.add(provider.name)
+                    if self.providers.has_alternative(failed):
+                        continue
+                except CircuitOpenError:
+                    # The circuit opened while this attempt waited for a slot;
+                    # nothing has been yielded yet.
+                    if attempt >= self.retry.max_attempts:
+                        output = self._stub(prompt)
+                        break
+                    failed.add(provider.name)
+                    continue
+                await asyncio.sleep(self.retry.delay(attempt))
+
+        if output is not None:
+            for field in output.fields:
+                yield field
+            yield output
+            return
+
+        output = self._parse(parser.text.strip())
+        if self.cache is not None:
+            await self.cache.set(key, output)
+        yield output
+
+    async def _stream_attempt(
+        self, prompt: str, provider: LLMProvider, parser: FieldStreamParser,
+    ) -> AsyncIterator[LLMField]:
+        """One streamed completion, yielding each field the parser closes. The
+        whole stream shares one LLM_TIMEOUT_SECONDS deadline, so a slow trickle
+        can't hold the provider slot indefinitely."""
+        async with provider.acquire():
+            started = time.monotonic()
+            deadline = asyncio.get_running_loop().time() + LLM_TIMEOUT_SECONDS
+            try:
+                async with asyncio.timeout_at(deadline):
+                    stream = await provider.client.chat.completions.create(
+                        model=provider.model,
+                        max_tokens=2048,
+                        stream=True,
+                        messages=[
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt},
+                        ],
+                    )
+                async with stream:
+                    chunks = aiter(stream)
+                    while True:
+                        async with asyncio.timeout_at(deadline):
+                            chunk = await anext(chunks, None)
+                        if chunk is None:
+                            break
+                        if not chunk.choices or not chunk.choices[0].delta.content:
+                            continue
+                        for data in parser.feed(chunk.choices[0].delta.content):
+                            try:
+                                field = LLMField(**data)
+                            except (ValidationError, TypeError):
+                                # Reported with full context by _parse once the stream ends.
+                                continue
+                            yield field
+            except Exception:
+                provider.record_failure()
+                raise
+            elapsed = time.monotonic() - started
+            provider.record_success(elapsed)
+            self.latency.record(elapsed)
+
+    async def _complete_and_store(self, key: str, prompt: str) -> LLMFormOutput:
+        output = await self._complete(prompt)
+        if self.cache is not None:
+            await self.cache.set(key, output)
+        return output
+
+    async def _complete(self, prompt: str) -> LLMFormOutput:
+        """Runs attempts under the retry policy. A provider that fails with a
+        transient error is avoided for the rest of the call, and when another
+        healthy provider exists the next attempt goes there without backoff."""
+        attempt = 0
+        failed: set[str] = set()
+        while True:
+            attempt += 1
+            provider = self.providers.select(exclude=failed)
+            try:
+                return await self._hedged_attempt(prompt, provider, exclude=failed)
+            except TRANSIENT_ERRORS:
+                if attempt >= self.retry.max_attempts:
+                    raise
+                failed.add(provider.name)
+                if self.providers.has_alternative(failed):
+                    continue
+            except CircuitOpenError:
+                # The breaker opened, or another call took its half-open
+                # trial, while this attempt waited for a slot.
+                if attempt >= self.retry.max_attempts:
+                    raise
+                failed.add(provider.name)
+                continue
+            except GenerationOutputError:
+                if attempt >= self.retry.max_attempts:
+                    raise
+            await asyncio.sleep(self.retry.delay(attempt))
+
+    async def _hedged_attempt(self, prompt: str, provider: LLMProvider, exclude: set[str]) -> LLMFormOutput:
+        """Sends a second, identical request (to the next-best provider when
+        there is one) if the first has not answered within the recent p95
+        latency, and keeps whichever finishes first."""
+        hedge_after = self.latency.percentile(0.95) if len(self.latency) >= LLM_HEDGE_MIN_SAMPLES else None
+        if not LLM_HEDGE_ENABLED or hedge_after is None:
+            return await self._attempt(prompt, provider)
+
+        tasks = {asyncio.ensure_future(self._attempt(prompt, provider))}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                try:
+                    hedge = self.providers.select(exclude=exclude | {provider.name})
+                except CircuitOpenError:
+                    hedge = None
+                if hedge is not None:
+                    tasks.add(asyncio.ensure_future(self._attempt(prompt, hedge)))
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            # Every request failed; surface the last error.
+            return done.pop().result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _attempt(self, prompt: str, provider: LLMProvider) -> LLMFormOutput:
+        async with provider.acquire():
+            started = time.monotonic()
+            try:
+                response = await asyncio.wait_for(
+                    provider.client.chat.completions.create(
+                        model=provider.model,
+                        max_tokens=2048,
+                        messages=[
+                            {"role": "system", "content": SYSTEM_PROMPT},
+                            {"role": "user", "content": prompt},
+                        ],
+                    ),
+                    timeout=LLM_TIMEOUT_SECONDS,
+                )
+            except Exception:
+                provider.record_failure()
+                raise
+            elapsed = time.monotonic() - started
+            provider.record_success(elapsed)
+            self.latency.record(elapsed)
+        return self._parse(response.choices[0].message.content.strip())
 
+    def _parse(self, raw: str) -> LLMFormOutput:
         try:
             data = json.loads(raw)
         except json.JSONDecodeError as exc:
@@ -72,7 +295,8 @@ class GenerationService:
             ) from exc
 
     def _stub(self, prompt: str) -> LLMFormOutput:
-        """Returns a deterministic stub when no API key is configured."""
+        """Returns a deterministic stub when no API key is configured or the
+        provider circuit is open."""
         return LLMFormOutput(
             name="Contact Form",
             description="A simple contact form generated from prompt: " + prompt[:60],
@@ -0,0 +1,32 @@
+"""Single-flight de-duplication for in-flight LLM calls."""
+import asyncio
+from typing import Awaitable, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Coalesces concurrent calls that share a key: the first caller starts the
+    call as its own task, later callers await that task and receive the same
+    result (or exception). Nothing is remembered once the call completes.
+
+    The shared task is shielded, so a caller that disconnects does not cancel
+    the work the other waiters depend on."""
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task[T]] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _forget(self, key: str, task: asyncio.Task[T]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
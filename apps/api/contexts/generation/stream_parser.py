@@ -0,0 +1,74 @@
+"""Incremental parser for streamed LLM output.
+
+Scans the completion text as it arrives and hands back each element of the
+top-level "fields" array as soon as its closing brace is seen, without waiting
+for the rest of the document.
+"""
+import json
+
+
+class FieldStreamParser:
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_key: str | None = None
+        self._pending_key: str | None = None
+        self._fields_depth: int | None = None
+        self._object_start: int | None = None
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> list[dict]:
+        """Consumes the next chunk and returns the field objects it completed."""
+        self._text += chunk
+        completed: list[dict] = []
+        text = self._text
+
+        while self._pos < len(text):
+            i = self._pos
+            ch = text[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = text[self._string_start:i]
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i + 1
+            elif ch == ":" and self._depth == 1:
+                self._pending_key = self._last_key
+            elif ch == "," and self._depth == 1:
+                self._pending_key = None
+            elif ch in "{[":
+                if ch == "[" and self._depth == 1 and self._pending_key == "fields":
+                    self._fields_depth = self._depth + 1
+                elif ch == "{" and self._depth == self._fields_depth:
+                    self._object_start = i
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if ch == "]" and self._fields_depth is not None and self._depth < self._fields_depth:
+                    self._fields_depth = None
+                elif ch == "}" and self._object_start is not None and self._depth == self._fields_depth:
+                    try:
+                        completed.append(json.loads(text[self._object_start:i + 1]))
+                    except json.JSONDecodeError:
+                        pass
+                    self._object_start = None
+
+        return completed
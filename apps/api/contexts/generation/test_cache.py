@@ -0,0 +1,165 @@
+"""Unit tests for the generation cache — key normalization, TTL, LRU and the service hit path."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from contexts.app_services import get_app_services
+from contexts.form_design.router import router
+from contexts.generation.cache import GenerationCache, InMemoryGenerationCache, cache_key
+from contexts.generation.providers import LLMProvider, ProviderPool
+from contexts.generation.resilience import CircuitBreaker
+from contexts.generation.schemas import LLMFormOutput
+from contexts.generation.service import GenerationService, SYSTEM_PROMPT
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeCompletions:
+    def __init__(self, content: str, delay: float = 0.0):
+        self.content = content
+        self.delay = delay
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        message = type("Message", (), {"content": self.content})
+        choice = type("Choice", (), {"message": message})
+        return type("Response", (), {"choices": [choice]})
+
+
+class FakeClient:
+    def __init__(self, content: str, delay: float = 0.0):
+        self.chat = type("Chat", (), {"completions": FakeCompletions(content, delay)})
+
+
+def _service(client: FakeClient) -> GenerationService:
+    provider = LLMProvider(
+        name="fake", client=client, model="fake-model", max_concurrency=10,
+        breaker=CircuitBreaker(failure_threshold=5, reset_timeout=30),
+    )
+    cache = InMemoryGenerationCache(ttl_seconds=60, max_entries=10)
+    return GenerationService(cache=cache, providers=ProviderPool([provider]))
+
+
+def _output(name: str = "Contact") -> LLMFormOutput:
+    return LLMFormOutput(name=name, fields=[{"key": "email", "type": "email", "label": "Email"}])
+
+
+# ---------------------------------------------------------------------------
+# Keys
+# ---------------------------------------------------------------------------
+
+def test_key_ignores_case_and_whitespace():
+    assert cache_key("  Contact   form ", "m", SYSTEM_PROMPT) == cache_key("contact form", "m", SYSTEM_PROMPT)
+
+
+def test_key_depends_on_model_and_system_prompt():
+    base = cache_key("contact form", "m1", SYSTEM_PROMPT)
+    assert base != cache_key("contact form", "m2", SYSTEM_PROMPT)
+    assert base != cache_key("contact form", "m1", SYSTEM_PROMPT + "!")
+
+
+# ---------------------------------------------------------------------------
+# In-memory backend
+# ---------------------------------------------------------------------------
+
+def test_entry_expires_after_ttl():
+    clock = FakeClock()
+    cache = InMemoryGenerationCache(ttl_seconds=10, max_entries=10, clock=clock)
+    asyncio.run(cache.set("k", _output()))
+    clock.now = 9
+    assert asyncio.run(cache.get("k")) is not None
+    clock.now = 10
+    assert asyncio.run(cache.get("k")) is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = InMemoryGenerationCache(ttl_seconds=60, max_entries=2)
+
+    async def scenario():
+        await cache.set("a", _output("A"))
+        await cache.set("b", _output("B"))
+        await cache.get("a")
+        await cache.set("c", _output("C"))
+        return [await cache.get(k) for k in ("a", "b", "c")]
+
+    a, b, c = asyncio.run(scenario())
+    assert b is None
+    assert a.name == "A"
+    assert c.name == "C"
+
+
+# ---------------------------------------------------------------------------
+# GenerationService
+# ---------------------------------------------------------------------------
+
+def test_cache_hit_skips_llm_client():
+    client = FakeClient(_output().model_dump_json())
+    service = _service(client)
+
+    first = asyncio.run(service.generate("Contact form"))
+    second = asyncio.run(service.generate("contact  FORM"))
+
+    assert client.chat.completions.calls == 1
+    assert second == first
+    assert service.cache.stats.hits == 1
+
+
+def test_concurrent_identical_prompts_share_one_llm_call():
+    client = FakeClient(_output().model_dump_json(), delay=0.2)
+    service = _service(client)
+
+    async def burst():
+        return await asyncio.gather(*(service.generate("Job application") for _ in range(5)))
+
+    results = asyncio.run(burst())
+
+    assert client.chat.completions.calls == 1
+    assert len(results) == 5
+
+
+def test_backend_must_implement_load_and_store():
+    class Incomplete(GenerationCache):
+        async def _load(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def _cache_stats(generation_service) -> dict:
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_app_services] = lambda: SimpleNamespace(generation_service=generation_service)
+    return TestClient(app).get("/design/generation-cache").json()
+
+
+def test_cache_stats_endpoint_reports_hits_and_misses():
+    service = _service(FakeClient(_output().model_dump_json()))
+    asyncio.run(service.generate("Contact form"))
+    asyncio.run(service.generate("contact form"))
+    asyncio.run(service.generate("contact form"))
+
+    assert _cache_stats(service) == {"backend": "memory", "hits": 2, "misses": 1, "hit_ratio": 2 / 3}
+
+
+def test_cache_stats_endpoint_with_cache_off(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_BACKEND", "off")
+    service = GenerationService(providers=ProviderPool([]))
+
+    assert _cache_stats(service) == {"backend": "off", "hits": 0, "misses": 0, "hit_ratio": None}
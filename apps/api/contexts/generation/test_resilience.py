@@ -0,0 +1,278 @@
+"""Unit tests for the LLM resilience layer — breaker states, backoff, retries, fallback, hedging, routing
+and streaming deadlines."""
+import asyncio
+
+import pytest
+
+import contexts.generation.service as generation_service
+from contexts.generation.cache import InMemoryGenerationCache
+from contexts.generation.providers import LLMProvider, ProviderPool
+from contexts.generation.resilience import CircuitBreaker, LatencyTracker, RetryPolicy
+from contexts.generation.schemas import LLMField, LLMFormOutput
+from contexts.generation.service import GenerationService
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+VALID = LLMFormOutput(name="Survey", fields=[{"key": "email", "type": "email", "label": "Email"}]).model_dump_json()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeStream:
+    """Streamed completion delivering content in pieces, pausing before each
+    (one pause for every piece, or one per piece)."""
+
+    def __init__(self, pieces: list[str], pause: float | list[float] = 0.0):
+        self.pieces = pieces
+        self.pauses = pause if isinstance(pause, list) else [pause] * len(pieces)
+        self.closed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.closed = True
+
+    async def __aiter__(self):
+        for pause, piece in zip(self.pauses, self.pieces):
+            await asyncio.sleep(pause)
+            delta = type("Delta", (), {"content": piece})
+            yield type("Chunk", (), {"choices": [type("Choice", (), {"delta": delta})]})
+
+
+class ScriptedCompletions:
+    """Replies with each scripted (delay, content-or-exception) in turn; a
+    streamed request gets the content as a FakeStream unless the script
+    supplies one."""
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        delay, reply = self.script[min(self.calls, len(self.script) - 1)]
+        self.calls += 1
+        await asyncio.sleep(delay)
+        if isinstance(reply, Exception):
+            raise reply
+        if kwargs.get("stream"):
+            return reply if isinstance(reply, FakeStream) else FakeStream([reply])
+        message = type("Message", (), {"content": reply})
+        return type("Response", (), {"choices": [type("Choice", (), {"message": message})]})
+
+
+def _provider(name: str, script, failure_threshold: int = 5, max_concurrency: int = 10, clock=None) -> LLMProvider:
+    client = type("Client", (), {"chat": type("Chat", (), {"completions": ScriptedCompletions(script)})})
+    breaker = CircuitBreaker(failure_threshold=failure_threshold, reset_timeout=60, **({"clock": clock} if clock else {}))
+    return LLMProvider(name=name, client=client, model="fake-model", max_concurrency=max_concurrency, breaker=breaker)
+
+
+def _service(*providers: LLMProvider) -> GenerationService:
+    cache = InMemoryGenerationCache(ttl_seconds=60, max_entries=10)
+    service = GenerationService(cache=cache, providers=ProviderPool(list(providers)))
+    service.retry = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+    service.latency = LatencyTracker()
+    return service
+
+
+def _calls(provider: LLMProvider) -> int:
+    return provider.client.chat.completions.calls
+
+
+# ---------------------------------------------------------------------------
+# Primitives
+# ---------------------------------------------------------------------------
+
+def test_breaker_opens_after_threshold_and_half_opens_after_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    clock.now = 10
+    assert breaker.allow()          # single half-open trial
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_failed_half_open_trial_reopens_breaker():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_retry_delay_is_jittered_and_capped():
+    policy = RetryPolicy(max_attempts=5, base_delay=1, max_delay=4)
+    assert all(0 <= policy.delay(attempt) <= min(4, 2 ** (attempt - 1)) for attempt in range(1, 6) for _ in range(50))
+
+
+# ---------------------------------------------------------------------------
+# GenerationService
+# ---------------------------------------------------------------------------
+
+def test_unparseable_output_is_retried():
+    provider = _provider("a", [(0, "not json"), (0, VALID)])
+    output = asyncio.run(_service(provider).generate("survey"))
+    assert output.name == "Survey"
+    assert _calls(provider) == 2
+
+
+def test_timeouts_are_retried_and_counted_against_breaker():
+    provider = _provider("a", [(0, asyncio.TimeoutError()), (0, asyncio.TimeoutError()), (0, VALID)])
+    output = asyncio.run(_service(provider).generate("survey"))
+    assert output.name == "Survey"
+    assert provider.breaker.state == "closed"
+    assert provider.error_ewma > 0
+
+
+def test_open_breaker_falls_back_to_stub_without_caching():
+    provider = _provider("a", [(0, asyncio.TimeoutError())], failure_threshold=2)
+    service = _service(provider)
+    output = asyncio.run(service.generate("survey"))
+    assert output.name == "Contact Form"
+    assert _calls(provider) == 2
+    assert asyncio.run(service.cache.get(generation_service.cache_key("survey", service.model, generation_service.SYSTEM_PROMPT))) is None
+
+
+def test_hedged_request_wins_when_primary_is_slow(monkeypatch):
+    monkeypatch.setattr(generation_service, "LLM_HEDGE_ENABLED", True)
+    monkeypatch.setattr(generation_service, "LLM_HEDGE_MIN_SAMPLES", 1)
+    provider = _provider("a", [(1.0, VALID), (0, VALID)])
+    service = _service(provider)
+    service.latency.record(0.05)
+
+    async def timed():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await service.generate("survey")
+        return loop.time() - started
+
+    assert asyncio.run(timed()) < 0.5
+    assert _calls(provider) == 2
+
+
+# ---------------------------------------------------------------------------
+# Provider routing
+# ---------------------------------------------------------------------------
+
+def test_pool_prefers_lowest_expected_latency():
+    fast, slow = _provider("fast", [(0, VALID)]), _provider("slow", [(0, VALID)])
+    fast.record_success(0.2)
+    slow.record_success(2.0)
+    assert ProviderPool([slow, fast]).select().name == "fast"
+
+    for _ in range(4):
+        fast.record_failure()
+    assert ProviderPool([slow, fast]).select().name == "fast"   # still cheaper per success
+    assert ProviderPool([slow, fast]).select(exclude={"fast"}).name == "slow"
+
+
+def test_transient_failure_fails_over_to_next_provider():
+    broken = _provider("broken", [(0, asyncio.TimeoutError())])
+    healthy = _provider("healthy", [(0, VALID)])
+    broken.record_success(0.1)
+    healthy.record_success(0.5)
+
+    output = asyncio.run(_service(broken, healthy).generate("survey"))
+
+    assert output.name == "Survey"
+    assert (_calls(broken), _calls(healthy)) == (1, 1)
+
+
+async def _collect(service: GenerationService, prompt: str, items: list) -> list:
+    async for item in service.generate_stream(prompt):
+        items.append(item)
+    return items
+
+
+def test_stream_fails_over_before_the_first_field():
+    broken = _provider("broken", [(0, asyncio.TimeoutError())])
+    healthy = _provider("healthy", [(0, VALID)])
+    broken.record_success(0.1)
+    healthy.record_success(0.5)
+
+    items = asyncio.run(_collect(_service(broken, healthy), "survey", []))
+
+    assert isinstance(items[0], LLMField) and items[-1].name == "Survey"
+    assert (_calls(broken), _calls(healthy)) == (1, 1)
+
+
+def test_trickling_stream_is_cut_off_at_the_deadline(monkeypatch):
+    monkeypatch.setattr(generation_service, "LLM_TIMEOUT_SECONDS", 0.05)
+    trickle = FakeStream(list(VALID), pause=0.01)
+    provider = _provider("a", [(0, trickle)])
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(_collect(_service(provider), "survey", []))
+
+    assert _calls(provider) == 3            # retried: no field had been sent
+    assert trickle.closed
+    assert not provider.slots.locked()
+    assert provider.error_ewma > 0
+
+
+def test_stream_is_not_retried_once_a_field_is_sent(monkeypatch):
+    monkeypatch.setattr(generation_service, "LLM_TIMEOUT_SECONDS", 0.1)
+    # The first piece closes the only field; the rest stalls past the deadline.
+    provider = _provider("a", [(0, FakeStream([VALID[:-2], VALID[-2:]], pause=[0, 1]))])
+    items = []
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(_collect(_service(provider), "survey", items))
+
+    assert [type(item) for item in items] == [LLMField]
+    assert _calls(provider) == 1
+
+
+def test_cancelled_slot_waiter_does_not_keep_half_open_trial():
+    clock = FakeClock()
+    provider = _provider("a", [(0, VALID)], failure_threshold=1, max_concurrency=1, clock=clock)
+    provider.record_failure()
+    clock.now = 60
+    service = _service(provider)
+
+    async def scenario():
+        await provider.slots.acquire()      # the only slot is busy
+        waiter = asyncio.ensure_future(service._attempt("survey", provider))
+        await asyncio.sleep(0)
+        waiter.cancel()                     # e.g. a hedge loser or a client disconnect
+        await asyncio.gather(waiter, return_exceptions=True)
+        provider.slots.release()
+        assert provider.breaker.state == "half_open" and provider.breaker.available()
+        return await service.generate("survey")
+
+    assert asyncio.run(scenario()).name == "Survey"
+    assert provider.breaker.state == "closed"
+
+
+def test_queued_call_on_half_open_provider_runs_after_trial_succeeds():
+    clock = FakeClock()
+    provider = _provider("a", [(0.05, VALID)], failure_threshold=1, max_concurrency=1, clock=clock)
+    provider.record_failure()
+    clock.now = 60
+    service = _service(provider)
+
+    async def scenario():
+        # Both calls are routed to the half-open provider; only the one that
+        # gets the slot first takes the trial, and its success closes the
+        # breaker before the second is admitted.
+        return await asyncio.gather(service._attempt("one", provider), service._attempt("two", provider))
+
+    assert [o.name for o in asyncio.run(scenario())] == ["Survey", "Survey"]
+    assert _calls(provider) == 2
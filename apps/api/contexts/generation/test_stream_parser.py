@@ -0,0 +1,47 @@
+"""Unit tests for FieldStreamParser — fields surface as soon as they close, whatever the chunking."""
+import json
+
+from contexts.generation.stream_parser import FieldStreamParser
+
+
+DOCUMENT = json.dumps({
+    "name": "Support {ticket}",
+    "description": "Says \"fields\": [ inside a string",
+    "fields": [
+        {"key": "email", "type": "email", "label": "Email \"work\" {}", "required": True},
+        {"key": "topic", "type": "select", "label": "Topic", "options": [{"label": "A", "value": "a"}]},
+        {"key": "notes", "type": "textarea", "label": "Notes"},
+    ],
+    "layout": {"columns": 2},
+})
+
+
+def _feed_in_chunks(size: int) -> list[list[dict]]:
+    parser = FieldStreamParser()
+    return [parser.feed(DOCUMENT[i:i + size]) for i in range(0, len(DOCUMENT), size)]
+
+
+def test_every_field_is_emitted_once_in_order():
+    for size in (1, 3, 7, 64, len(DOCUMENT)):
+        emitted = [f for batch in _feed_in_chunks(size) for f in batch]
+        assert [f["key"] for f in emitted] == ["email", "topic", "notes"]
+
+
+def test_field_is_emitted_before_the_document_ends():
+    parser = FieldStreamParser()
+    cut = DOCUMENT.index('"topic"')
+    first = parser.feed(DOCUMENT[:cut])
+    assert [f["key"] for f in first] == ["email"]
+    assert first[0]["label"] == 'Email "work" {}'
+
+
+def test_nested_options_are_kept_with_their_field():
+    emitted = [f for batch in _feed_in_chunks(5) for f in batch]
+    assert emitted[1]["options"] == [{"label": "A", "value": "a"}]
+
+
+def test_text_accumulates_full_completion():
+    parser = FieldStreamParser()
+    for i in range(0, len(DOCUMENT), 10):
+        parser.feed(DOCUMENT[i:i + 10])
+    assert json.loads(parser.text)["layout"] == {"columns": 2}
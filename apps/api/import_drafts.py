@@ -0,0 +1,38 @@
+"""Bulk import — loads NDJSON FormDrafts (one per line) into drafts and the catalog.
+Run with: python import_drafts.py drafts.ndjson   (or - for stdin)
+"""
+import asyncio
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from shared.database import AsyncSessionLocal
+from contexts.form_design.importer import DraftImporter
+
+
+async def run(path: str):
+    source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    started = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as db:
+            result = await DraftImporter(db).import_lines(source)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    elapsed = time.perf_counter() - started
+
+    for error in result.errors:
+        messages = "; ".join(f"{e.field}: {e.message}" for e in error.errors)
+        print(f"  ✗ line {error.line}: {messages}", file=sys.stderr)
+    rate = result.imported / elapsed if elapsed else 0
+    print(f"\nDone — {result.imported} imported, {result.failed} failed in {elapsed:.1f}s ({rate:.0f} forms/s).")
+    return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__.strip(), file=sys.stderr)
+        sys.exit(2)
+    sys.exit(asyncio.run(run(sys.argv[1])))
@@ -1,9 +1,29 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contexts.form_design.router import router as design_router
 from contexts.form_catalog.router import router as catalog_router
+from contexts.form_design.jobs import JobWorkerPool, JOB_WORKERS
+from contexts.app_services import AppServices
+from shared.compression import COMPRESSION_ENABLED, CompressionMiddleware
 
-app = FastAPI(title="FormGen API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    services = AppServices.create()
+    app.state.services = services
+    services.start()
+    # JOB_WORKERS=0 leaves queued generation jobs to standalone worker.py processes.
+    workers = JobWorkerPool(services) if JOB_WORKERS > 0 else None
+    if workers:
+        workers.start()
+    yield
+    if workers:
+        await workers.stop()
+    await services.aclose()
+
+
+app = FastAPI(title="FormGen API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,7 +34,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
 
 app.include_router(design_router)
 app.include_router(catalog_router)
@@ -1,12 +1,13 @@
 """Seed script — inserts sample published forms directly via FormDesignService.
 Run with: python seed.py
 """
+import asyncio
 import sys
 import os
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from shared.database import SessionLocal
+from shared.database import AsyncSessionLocal
 from contexts.form_design.schemas import (
     FormDraft, FormFieldDraft, FormLayoutDraft, FormActionDraft, FormFieldLayout,
     GenerationRequest,
@@ -90,13 +91,15 @@ SAMPLES = [
 ]
 
 
-def run():
+async def run():
     from contexts.generation.translator import LLMTranslator
     from contexts.form_catalog.service import FormCatalogService
+    from contexts.form_design.revisions import RevisionStore
 
-    db = SessionLocal()
+    db = AsyncSessionLocal()
     translator = LLMTranslator()
     catalog_service = FormCatalogService(db)
+    revisions = RevisionStore(db)
     validator_cls = __import__(
         "contexts.form_design.validator", fromlist=["FormDraftValidator"]
     ).FormDraftValidator
@@ -125,16 +128,19 @@ def run():
             created_at=datetime.fromisoformat(draft.created_at),
             updated_at=datetime.fromisoformat(draft.updated_at),
         )
-        db.merge(model)
-        db.commit()
+        await db.merge(model)
+        # Base snapshot, as FormDesignService records for new drafts, so
+        # every version can be rebuilt from the revision history.
+        revisions.record_created([draft])
+        await db.commit()
 
         # Publish to catalog
-        catalog_service.publish(draft)
+        await catalog_service.publish(draft)
         print(f"  ✓ Seeded '{draft.name}' (id={draft.id[:8]}...)")
 
-    db.close()
+    await db.close()
     print(f"\nDone — {len(SAMPLES)} forms seeded.")
 
 
 if __name__ == "__main__":
-    run()
+    asyncio.run(run())
@@ -0,0 +1,194 @@
+"""HTTP content codings: gzip, plus brotli when the brotli package is installed,
+and the response compression middleware built on them."""
+import gzip
+import os
+import zlib
+from typing import Iterable
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred first: brotli is smaller at comparable cost.
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+# On-the-fly levels: fast settings that still get most of the gain on JSON.
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_STREAMING = os.getenv("COMPRESSION_STREAMING", "true").lower() == "true"
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """`level` is the gzip compresslevel (1-9) or the brotli quality (0-11)."""
+    if encoding == "br":
+        return brotli.compress(body, quality=level)
+    if encoding == "gzip":
+        # mtime=0 keeps the output a pure function of the input.
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    raise ValueError(f"Unsupported content coding {encoding!r}")
+
+
+def negotiate_encoding(accept_encoding: str | None, available: Iterable[str] = SUPPORTED_ENCODINGS) -> str | None:
+    """The first of `available` that Accept-Encoding allows with the highest
+    q-value, or None for the identity coding."""
+    if not accept_encoding:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class _StreamCompressor:
+    """Compresses a body chunk by chunk, flushing after each one so every
+    chunk reaches the client as soon as it is produced."""
+
+    def __init__(self, encoding: str, level: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=level)
+        else:
+            self._brotli = None
+            self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self._brotli is not None:
+            return self._brotli.finish()
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """Compresses JSON, NDJSON and text responses in the best coding the
+    client accepts. Responses are left alone when they are:
+    - already encoded, like the catalog's pre-compressed forms;
+    - smaller than `minimum_size`;
+    - server-sent events.
+    A body that arrives in several messages, such as a StreamingResponse, is
+    compressed chunk by chunk with a flush after each one when `streaming` is
+    on. Otherwise it is sent uncompressed."""
+
+    COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+        streaming: bool = COMPRESSION_STREAMING,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+        self.streaming = streaming
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await _CompressedResponse(self, encoding, send).run(scope, receive)
+
+
+class _CompressedResponse:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start: Message | None = None
+        self.compressor: _StreamCompressor | None = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.on_send)
+
+    def _compressible(self, headers: Headers) -> bool:
+        content_type = headers.get("content-type", "")
+        return (
+            "content-encoding" not in headers
+            and content_type.startswith(CompressionMiddleware.COMPRESSIBLE_TYPES)
+            and not content_type.startswith("text/event-stream")
+        )
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # The encoded bytes differ from the identity body the upstream tag
+        # names, so the tag can only claim semantic equivalence (RFC 9110 §8.8.1).
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+
+    async def on_send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            self.passthrough = not self._compressible(Headers(raw=message["headers"]))
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        level = self.middleware.levels[self.encoding]
+
+        if self.compressor is None and not more_body:
+            # The whole body in one message: compress it if it is worth it.
+            headers = MutableHeaders(raw=self.start["headers"])
+            if len(body) >= self.middleware.minimum_size:
+                body = compress(body, self.encoding, level)
+                self._mark_encoded(headers)
+                headers["Content-Length"] = str(len(body))
+            await self.send(self.start)
+            await self.send({"type": "http.response.body", "body": body})
+            return
+
+        if self.compressor is None:
+            # First chunk of a streamed body.
+            if not self.middleware.streaming:
+                self.passthrough = True
+                await self.send(self.start)
+                await self.send(message)
+                return
+            headers = MutableHeaders(raw=self.start["headers"])
+            del headers["Content-Length"]
+            self._mark_encoded(headers)
+            self.compressor = _StreamCompressor(self.encoding, level)
+            await self.send(self.start)
+
+        data = self.compressor.chunk(body) if body else b""
+        if not more_body:
+            data += self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 
 
 class FieldValidationError(BaseModel):
@@ -6,6 +6,14 @@ class FieldValidationError(BaseModel):
     message: str
 
 
+def field_errors(error: ValidationError) -> list[FieldValidationError]:
+    """Flattens a pydantic ValidationError into dotted-path field errors."""
+    return [
+        FieldValidationError(field=".".join(str(p) for p in err["loc"]) or "body", message=err["msg"])
+        for err in error.errors()
+    ]
+
+
 class DraftValidationError(Exception):
     def __init__(self, errors: list[FieldValidationError]):
         self.errors = errors
@@ -17,3 +25,25 @@ class GenerationOutputError(Exception):
     def __init__(self, message: str):
         self.errors = [FieldValidationError(field="llm_output", message=message)]
         super().__init__(message)
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+    def __init__(self, cursor: str):
+        super().__init__(f"Invalid pagination cursor: {cursor!r}")
+
+
+class PatchError(Exception):
+    """Raised when a JSON Patch operation cannot be applied to a draft."""
+    def __init__(self, path: str, message: str):
+        self.errors = [FieldValidationError(field=path or "/", message=message)]
+        super().__init__(f"{path}: {message}")
+
+
+class VersionConflictError(Exception):
+    """Raised when a draft write expects a version the draft is no longer at."""
+    def __init__(self, draft_id: str, current_version: int | None = None):
+        self.draft_id = draft_id
+        self.current_version = current_version
+        detail = f" (current version is {current_version})" if current_version is not None else ""
+        super().__init__(f"Draft '{draft_id}' was modified by another request{detail}.")
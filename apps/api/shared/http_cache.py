@@ -0,0 +1,34 @@
+"""Helpers for HTTP conditional requests and cache headers."""
+import hashlib
+
+
+def make_etag(*parts: object) -> str:
+    """Strong entity tag over the given version markers."""
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def encoded_etag(etag: str, encoding: str | None) -> str:
+    """Strong tag of one content coding of the representation etag names, so
+    the identity, gzip and br bodies are never taken for the same bytes."""
+    if encoding is None:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 §13.1.2), so a W/ prefix
+    on the client's copy still matches."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def cache_control(max_age: int, stale_while_revalidate: int) -> str:
+    value = f"public, max-age={max_age}"
+    if stale_while_revalidate > 0:
+        value += f", stale-while-revalidate={stale_while_revalidate}"
+    return value
@@ -0,0 +1,54 @@
+"""Keyset (cursor) pagination for newest-first listings.
+
+Pages are ordered by (timestamp, id) descending and continue strictly after the
+last row of the previous page, so each page is an index range scan no matter
+how deep the client has paged. The cursor is an opaque token over that pair.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Sequence
+from sqlalchemy import Select, tuple_
+from shared.errors import InvalidCursorError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(sort_value: datetime, row_id: str) -> str:
+    raw = json.dumps([sort_value.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        sort_value, row_id = json.loads(raw)
+        return datetime.fromisoformat(sort_value), str(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(cursor) from e
+
+
+def paginate(stmt: Select, sort_column, id_column, limit: int, cursor: str | None) -> Select:
+    """Applies ordering, the cursor bound and limit + 1, so page() can tell
+    whether another page follows without a count query."""
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(sort_column, id_column) < tuple_(sort_value, row_id))
+    return stmt.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+
+
+def page(rows: Sequence[Any], limit: int, sort_attr: str) -> tuple[Sequence[Any], str | None]:
+    """Trims the look-ahead row and returns (rows, next_cursor)."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_attr), last.id)
+
+
+def name_pattern(name: str) -> str:
+    """Case-insensitive substring pattern for ILIKE, with wildcards in the
+    user's input escaped."""
+    escaped = name.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
@@ -0,0 +1,166 @@
+"""Unit tests for content-coding negotiation and compression."""
+import asyncio
+import gzip
+import zlib
+
+import pytest
+from starlette.responses import Response, StreamingResponse
+
+from shared.compression import SUPPORTED_ENCODINGS, CompressionMiddleware, compress, negotiate_encoding
+
+
+def test_no_header_means_identity():
+    assert negotiate_encoding(None, ["br", "gzip"]) is None
+    assert negotiate_encoding("", ["br", "gzip"]) is None
+
+
+def test_prefers_first_available_among_equal_weights():
+    assert negotiate_encoding("gzip, deflate, br", ["br", "gzip"]) == "br"
+    assert negotiate_encoding("gzip, deflate, br", ["gzip"]) == "gzip"
+
+
+def test_q_values_decide():
+    assert negotiate_encoding("br;q=0.5, gzip;q=0.9", ["br", "gzip"]) == "gzip"
+    assert negotiate_encoding("br;q=0, gzip;q=0", ["br", "gzip"]) is None
+
+
+def test_wildcard_covers_unlisted_codings():
+    assert negotiate_encoding("*", ["br", "gzip"]) == "br"
+    assert negotiate_encoding("br;q=0, *;q=0.1", ["br", "gzip"]) == "gzip"
+
+
+def test_unknown_codings_only_means_identity():
+    assert negotiate_encoding("deflate, zstd", ["br", "gzip"]) is None
+
+
+def test_gzip_is_deterministic_and_round_trips():
+    body = b'{"fields": []}' * 100
+    assert compress(body, "gzip", 9) == compress(body, "gzip", 9)
+    assert gzip.decompress(compress(body, "gzip", 9)) == body
+
+
+@pytest.mark.skipif("br" not in SUPPORTED_ENCODINGS, reason="brotli is not installed")
+def test_brotli_round_trips():
+    import brotli
+    body = b'{"fields": []}' * 100
+    assert brotli.decompress(compress(body, "br", 5)) == body
+
+
+def _call(app, accept_encoding: str | None = "gzip", **options) -> list[dict]:
+    """Runs one GET through CompressionMiddleware and returns the messages sent."""
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    # ASGI 2.4, as uvicorn speaks it: streams are not raced against receive().
+    scope = {"type": "http", "asgi": {"spec_version": "2.4"}, "method": "GET", "path": "/", "headers": headers}
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(CompressionMiddleware(app, **options)(scope, receive, send))
+    return sent
+
+
+def _headers(messages: list[dict]) -> dict[str, str]:
+    return {k.decode(): v.decode() for k, v in messages[0]["headers"]}
+
+
+def _body(messages: list[dict]) -> bytes:
+    return b"".join(m.get("body", b"") for m in messages[1:])
+
+
+JSON_BODY = b'{"fields": [' + b",".join(b'{"key": "field_%d", "type": "text"}' % i for i in range(200)) + b"]}"
+
+
+def test_large_json_is_compressed():
+    messages = _call(Response(JSON_BODY, media_type="application/json"), minimum_size=1024)
+    headers = _headers(messages)
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(_body(messages)) < len(JSON_BODY)
+    assert gzip.decompress(_body(messages)) == JSON_BODY
+
+
+def test_small_body_is_left_alone():
+    messages = _call(Response(b'{"ok": true}', media_type="application/json"), minimum_size=1024)
+    assert "content-encoding" not in _headers(messages)
+    assert _body(messages) == b'{"ok": true}'
+
+
+def test_identity_without_accept_encoding():
+    messages = _call(Response(JSON_BODY, media_type="application/json"), accept_encoding=None)
+    assert "content-encoding" not in _headers(messages)
+    assert _body(messages) == JSON_BODY
+
+
+def test_compressing_weakens_strong_etag():
+    def app():
+        return Response(JSON_BODY, media_type="application/json", headers={"ETag": '"abc"'})
+    assert _headers(_call(app(), minimum_size=0))["etag"] == 'W/"abc"'
+    assert _headers(_call(app(), accept_encoding=None))["etag"] == '"abc"'
+
+
+def test_compressing_keeps_weak_etag():
+    app = Response(JSON_BODY, media_type="application/json", headers={"ETag": 'W/"abc"'})
+    assert _headers(_call(app, minimum_size=0))["etag"] == 'W/"abc"'
+
+
+def test_already_encoded_body_passes_through():
+    stored = compress(JSON_BODY, "gzip", 9)
+    app = Response(stored, media_type="application/json", headers={"Content-Encoding": "gzip", "ETag": '"abc"'})
+    messages = _call(app, minimum_size=0)
+    assert _headers(messages)["content-encoding"] == "gzip"
+    assert _headers(messages)["etag"] == '"abc"'
+    assert _body(messages) == stored
+
+
+def test_incompressible_types_pass_through():
+    messages = _call(Response(b"\x89PNG" * 1000, media_type="image/png"), minimum_size=0)
+    assert "content-encoding" not in _headers(messages)
+
+
+def _stream(media_type: str, lines: list[bytes]) -> StreamingResponse:
+    async def chunks():
+        for line in lines:
+            yield line
+    return StreamingResponse(chunks(), media_type=media_type)
+
+
+def test_ndjson_stream_is_compressed_chunk_by_chunk():
+    lines = [b'{"id": "%d"}\n' % i for i in range(50)]
+    messages = _call(_stream("application/x-ndjson", lines), minimum_size=1024)
+    headers = _headers(messages)
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert "etag" not in headers
+
+    # Every chunk is flushed, so each line decodes as soon as it arrives.
+    decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    chunks = [m["body"] for m in messages[1:] if m["body"]]
+    assert [decoder.decompress(c) for c in chunks[:len(lines)]] == lines
+    assert gzip.decompress(_body(messages)) == b"".join(lines)
+
+
+def test_streams_pass_through_when_streaming_is_off():
+    lines = [b'{"id": "%d"}\n' % i for i in range(50)]
+    messages = _call(_stream("application/x-ndjson", lines), streaming=False)
+    assert "content-encoding" not in _headers(messages)
+    assert _body(messages) == b"".join(lines)
+
+
+def test_server_sent_events_are_not_compressed():
+    lines = [b"data: %d\n\n" % i for i in range(50)]
+    messages = _call(_stream("text/event-stream", lines), minimum_size=0)
+    assert "content-encoding" not in _headers(messages)
+    assert _body(messages) == b"".join(lines)
+
+
+@pytest.mark.skipif("br" not in SUPPORTED_ENCODINGS, reason="brotli is not installed")
+def test_brotli_preferred_when_accepted():
+    import brotli
+    lines = [b'{"id": "%d"}\n' % i for i in range(50)]
+    messages = _call(_stream("application/x-ndjson", lines), accept_encoding="gzip, br")
+    assert _headers(messages)["content-encoding"] == "br"
+    assert brotli.decompress(_body(messages)) == b"".join(lines)
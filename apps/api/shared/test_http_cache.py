@@ -0,0 +1,29 @@
+"""Unit tests for conditional-request helpers."""
+from shared.http_cache import cache_control, encoded_etag, etag_matches, make_etag
+
+
+def test_etag_is_stable_and_quoted():
+    etag = make_etag("form", "2026-01-01T00:00:00")
+    assert etag == make_etag("form", "2026-01-01T00:00:00")
+    assert etag != make_etag("form", "2026-01-01T00:00:01")
+    assert etag.startswith('"') and etag.endswith('"')
+
+
+def test_if_none_match_lists_and_weak_tags():
+    etag = make_etag("a")
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_encoded_etag_is_distinct_per_coding():
+    assert encoded_etag('"abc"', None) == '"abc"'
+    assert encoded_etag('"abc"', "gzip") == '"abc-gzip"'
+    assert encoded_etag('"abc"', "br") == '"abc-br"'
+
+
+def test_cache_control_omits_disabled_stale_while_revalidate():
+    assert cache_control(60, 300) == "public, max-age=60, stale-while-revalidate=300"
+    assert cache_control(60, 0) == "public, max-age=60"
@@ -0,0 +1,35 @@
+"""Unit tests for keyset pagination helpers."""
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from shared.errors import InvalidCursorError
+from shared.pagination import decode_cursor, encode_cursor, name_pattern, page
+
+
+def test_cursor_round_trips():
+    at = datetime(2026, 3, 4, 5, 6, 7, 891011)
+    assert decode_cursor(encode_cursor(at, "abc")) == (at, "abc")
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "", "W10", encode_cursor(datetime(2026, 1, 1), "x")[:-3]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+def test_page_trims_look_ahead_row_and_points_at_last_kept_row():
+    rows = [SimpleNamespace(id=str(i), created_at=datetime(2026, 1, 10 - i)) for i in range(3)]
+    kept, cursor = page(rows, 2, "created_at")
+    assert [r.id for r in kept] == ["0", "1"]
+    assert decode_cursor(cursor) == (rows[1].created_at, "1")
+
+
+def test_last_page_has_no_cursor():
+    rows = [SimpleNamespace(id="0", created_at=datetime(2026, 1, 1))]
+    assert page(rows, 2, "created_at") == (rows, None)
+
+
+def test_name_pattern_escapes_wildcards():
+    assert name_pattern("50%_off") == "%50\\%\\_off%"
@@ -0,0 +1,31 @@
+"""Standalone generation job worker — drains the generation_jobs queue.
+Run with: python worker.py
+Run as many as needed; jobs are claimed with SKIP LOCKED so workers never collide.
+"""
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from contexts.form_design.jobs import JobWorkerPool
+from contexts.app_services import AppServices
+
+
+async def run():
+    services = AppServices.create()
+    workers = JobWorkerPool(services)
+    workers.start()
+    print(f"Generation worker started with {workers.workers} task(s).")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await workers.stop()
+        await services.aclose()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -1,11 +1,13 @@
 import { Injectable, inject } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
-import { Observable } from 'rxjs';
+import { HttpClient, HttpResponse } from '@angular/common/http';
+import { EMPTY, Observable, expand, map, reduce } from 'rxjs';
 import {
   FormDraft, DraftSummary, GenerationRequest, DraftUpdateRequest,
 } from '../models/form-draft';
 
 const API = 'http://localhost:8000';
+// Largest page the API serves (MAX_PAGE_SIZE); fewer round trips per listing.
+const PAGE_SIZE = 200;
 
 @Injectable({ providedIn: 'root' })
 export class FormDesignApiService {
@@ -15,8 +17,20 @@ export class FormDesignApiService {
     return this.http.post<FormDraft>(`${API}/design/generate`, request);
   }
 
+  /** Every draft, newest first, following X-Next-Cursor across pages. */
   listDrafts(): Observable<DraftSummary[]> {
-    return this.http.get<DraftSummary[]>(`${API}/design/drafts`);
+    const page = (cursor?: string) => this.http.get<DraftSummary[]>(`${API}/design/drafts`, {
+      params: cursor ? { limit: PAGE_SIZE, cursor } : { limit: PAGE_SIZE },
+      observe: 'response',
+    });
+    return page().pipe(
+      expand((response: HttpResponse<DraftSummary[]>) => {
+        const next = response.headers.get('X-Next-Cursor');
+        return next ? page(next) : EMPTY;
+      }),
+      map((response) => response.body ?? []),
+      reduce((all, drafts) => all.concat(drafts), [] as DraftSummary[]),
+    );
   }
 
   getDraft(id: string): Observable<FormDraft> {
@@ -1,17 +1,31 @@
 import { Injectable, inject } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
-import { Observable } from 'rxjs';
+import { HttpClient, HttpResponse } from '@angular/common/http';
+import { EMPTY, Observable, expand, map, reduce } from 'rxjs';
 import { CatalogEntry } from '../models/catalog';
 import { RenderableForm } from '@formgen/ui';
 
 const API = 'http://localhost:8000';
+// Largest page the API serves (MAX_PAGE_SIZE); fewer round trips per listing.
+const PAGE_SIZE = 200;
 
 @Injectable({ providedIn: 'root' })
 export class FormCatalogApiService {
   private http = inject(HttpClient);
 
+  /** Every published form, newest first, following X-Next-Cursor across pages. */
   listForms(): Observable<CatalogEntry[]> {
-    return this.http.get<CatalogEntry[]>(`${API}/catalog/forms`);
+    const page = (cursor?: string) => this.http.get<CatalogEntry[]>(`${API}/catalog/forms`, {
+      params: cursor ? { limit: PAGE_SIZE, cursor } : { limit: PAGE_SIZE },
+      observe: 'response',
+    });
+    return page().pipe(
+      expand((response: HttpResponse<CatalogEntry[]>) => {
+        const next = response.headers.get('X-Next-Cursor');
+        return next ? page(next) : EMPTY;
+      }),
+      map((response) => response.body ?? []),
+      reduce((all, entries) => all.concat(entries), [] as CatalogEntry[]),
+    );
   }
 
   getForm(id: string): Observable<RenderableForm> {